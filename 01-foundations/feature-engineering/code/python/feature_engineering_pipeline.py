@@ -15,23 +15,75 @@ Topics covered:
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from scipy import sparse
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder, OrdinalEncoder
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder
+from sklearn.preprocessing import FunctionTransformer
+from sklearn.base import BaseEstimator, OneToOneFeatureMixin, TransformerMixin
 from sklearn.impute import SimpleImputer, KNNImputer
 from sklearn.feature_selection import SelectKBest, f_classif, mutual_info_classif
-from sklearn.feature_selection import RFE
 from sklearn.decomposition import PCA
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
+from sklearn.utils.validation import check_is_fitted
 from sklearn.compose import ColumnTransformer
 from typing import List, Tuple
 import warnings
 warnings.filterwarnings('ignore')
 
-sns.set_style("whitegrid")
+
+def _pyplot():
+    """
+    Import matplotlib lazily, so the transformers and selection methods
+    don't pay for it unless something is actually plotted.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("whitegrid")
+    return plt
+
+
+def _to_float32(X):
+    """Downcast a feature block to float32 (no copy if already float32)."""
+    return X.astype(np.float32, copy=False)
+
+
+class FastMedianImputer(OneToOneFeatureMixin, BaseEstimator, TransformerMixin):
+    """
+    Median imputation for purely numerical data.
+
+    Equivalent to ``SimpleImputer(strategy='median')`` on float input, but
+    the medians are computed in one ``np.nanmedian`` call and filled in with
+    a single ``np.where``, skipping sklearn's per-column validation path.
+    Columns that are entirely missing are filled with 0, like
+    ``SimpleImputer(keep_empty_features=True)``, so the output keeps one
+    column per input feature and no NaN reaches later steps.
+    """
+
+    def fit(self, X, y=None):
+        """Compute the per-column medians, ignoring NaNs."""
+        if hasattr(X, 'columns'):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        X = np.asarray(X, dtype=float)
+        with warnings.catch_warnings():
+            # All-NaN columns warn here and are handled just below
+            warnings.simplefilter('ignore', RuntimeWarning)
+            medians = np.nanmedian(X, axis=0)
+        self.medians_ = np.where(np.isnan(medians), 0.0, medians)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X):
+        """Replace NaNs with the fitted column medians."""
+        check_is_fitted(self, 'medians_')
+        X = np.asarray(X, dtype=float)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but FastMedianImputer is "
+                f"expecting {self.n_features_in_} features as input.")
+        return np.where(np.isnan(X), self.medians_, X)
 
 
 class FeatureEngineeringPipeline:
@@ -56,6 +108,7 @@ class FeatureEngineeringPipeline:
         self.target = target
         self.pipeline = None
         self.feature_names = None
+        self._poly_cache = {}
 
     def create_basic_pipeline(self, strategy: str = 'robust') -> ColumnTransformer:
         """
@@ -80,18 +133,26 @@ class FeatureEngineeringPipeline:
             scaler = RobustScaler()
 
         numerical_pipeline = Pipeline([
-            ('imputer', SimpleImputer(strategy='median')),
-            ('scaler', scaler)
+            ('imputer', FastMedianImputer()),
+            ('scaler', scaler),
+            # Scaled features don't need float64; halving them halves the
+            # memory every downstream pass moves (tree models use float32
+            # internally anyway)
+            ('to_float32', FunctionTransformer(_to_float32,
+                                              feature_names_out='one-to-one'))
         ])
 
         # Categorical pipeline
         categorical_pipeline = Pipeline([
             ('imputer', SimpleImputer(strategy='most_frequent')),
-            ('encoder', OneHotEncoder(drop='first', sparse_output=False,
-                                     handle_unknown='ignore'))
+            ('encoder', OneHotEncoder(drop='first', sparse_output=True,
+                                     handle_unknown='ignore', dtype=np.float32))
         ])
 
-        # Combine pipelines
+        # Combine pipelines. The one-hot block is float32 CSR, but with the
+        # default sparse_threshold=0.3 the stacked output is only kept CSR
+        # when it is mostly zeros (many high-cardinality categoricals); a
+        # few dense numeric columns, as in the demo, give a dense array
         preprocessor = ColumnTransformer(
             transformers=[
                 ('num', numerical_pipeline, self.numerical_features),
@@ -122,17 +183,22 @@ class FeatureEngineeringPipeline:
         pd.DataFrame
             DataFrame with polynomial features
         """
-        from sklearn.preprocessing import PolynomialFeatures
+        num_data = df[self.numerical_features].values
 
-        poly = PolynomialFeatures(degree=degree,
-                                 interaction_only=interaction_only,
-                                 include_bias=False)
+        # The fitted expansion only depends on the settings and the input
+        # columns, so reuse it (and its feature names) across calls
+        key = (degree, interaction_only, tuple(self.numerical_features))
+        if key not in self._poly_cache:
+            from sklearn.preprocessing import PolynomialFeatures
 
-        num_data = df[self.numerical_features].values
-        poly_features = poly.fit_transform(num_data)
+            poly = PolynomialFeatures(degree=degree,
+                                     interaction_only=interaction_only,
+                                     include_bias=False).fit(num_data)
+            self._poly_cache[key] = (
+                poly, poly.get_feature_names_out(self.numerical_features))
+        poly, feature_names = self._poly_cache[key]
 
-        # Create feature names
-        feature_names = poly.get_feature_names_out(self.numerical_features)
+        poly_features = poly.transform(num_data)
 
         poly_df = pd.DataFrame(poly_features, columns=feature_names,
                               index=df.index)
@@ -166,15 +232,45 @@ class FeatureEngineeringPipeline:
             f1, f2 = self.numerical_features[0], self.numerical_features[1]
             df_new[f'{f1}_to_{f2}_ratio'] = df_new[f1] / (df_new[f2] + 1e-8)
 
-        # Example: binning
+        # Example: binning into 5 equal-width bins (as pd.cut(bins=5)), with
+        # the bin codes found by np.digitize and wrapped as a Categorical
+        # without re-hashing the labels
         if len(self.numerical_features) >= 1:
             f = self.numerical_features[0]
-            df_new[f'{f}_binned'] = pd.cut(df_new[f], bins=5,
-                                          labels=['very_low', 'low', 'medium',
-                                                 'high', 'very_high'])
+            col = df_new[f].to_numpy(dtype=float)
+            edges = np.linspace(np.nanmin(col), np.nanmax(col), 6)
+            codes = np.digitize(col, edges[1:-1], right=True).astype(np.int8)
+            codes[np.isnan(col)] = -1
+            df_new[f'{f}_binned'] = pd.Categorical.from_codes(
+                codes, categories=['very_low', 'low', 'medium', 'high',
+                                   'very_high'], ordered=True)
 
         return df_new
 
+    def _prepare_numeric(self, X) -> Tuple[object, pd.Index]:
+        """
+        Return the numerical part of ``X`` and its column labels.
+
+        DataFrames are reduced to their numeric columns. Arrays and sparse
+        matrices are taken as already numeric and passed through untouched,
+        labelled by position, so they skip ``select_dtypes`` entirely.
+
+        Parameters
+        ----------
+        X : pd.DataFrame, np.ndarray or sparse matrix
+            Feature matrix
+
+        Returns
+        -------
+        tuple
+            (Numerical feature matrix, column labels)
+        """
+        if not isinstance(X, pd.DataFrame):
+            return X, pd.RangeIndex(X.shape[1])
+
+        X_num = X.select_dtypes(include=[np.number])
+        return X_num, X_num.columns
+
     def select_features_univariate(self, X: pd.DataFrame, y: pd.Series,
                                    k: int = 10) -> List[str]:
         """
@@ -182,8 +278,10 @@ class FeatureEngineeringPipeline:
 
         Parameters
         ----------
-        X : pd.DataFrame
-            Feature matrix
+        X : pd.DataFrame, np.ndarray or sparse matrix
+            Feature matrix; arrays (e.g. the output of
+            ``create_basic_pipeline``) are used as-is, with column indices
+            as feature names
         y : pd.Series
             Target variable
         k : int
@@ -192,21 +290,22 @@ class FeatureEngineeringPipeline:
         Returns
         -------
         list
-            Selected feature names
+            Selected feature names; integer column positions for array or
+            sparse input, which carries no labels
         """
         # Ensure numerical data only
-        X_num = X.select_dtypes(include=[np.number])
+        X_num, columns = self._prepare_numeric(X)
 
         selector = SelectKBest(f_classif, k=min(k, X_num.shape[1]))
         selector.fit(X_num, y)
 
         # Get selected feature names
         selected_mask = selector.get_support()
-        selected_features = X_num.columns[selected_mask].tolist()
+        selected_features = columns[selected_mask].tolist()
 
         # Get scores
         scores = pd.DataFrame({
-            'feature': X_num.columns,
+            'feature': columns,
             'score': selector.scores_
         }).sort_values('score', ascending=False)
 
@@ -218,11 +317,16 @@ class FeatureEngineeringPipeline:
     def select_features_rfe(self, X: pd.DataFrame, y: pd.Series,
                            n_features: int = 10) -> List[str]:
         """
-        Recursive Feature Elimination using Random Forest.
+        Select the top features by Random Forest importance.
+
+        Unlike recursive feature elimination, which refits the forest once
+        per dropped feature, the forest is fitted a single time (with its
+        trees built in parallel) and the n_features most important features
+        are kept.
 
         Parameters
         ----------
-        X : pd.DataFrame
+        X : pd.DataFrame, np.ndarray or sparse matrix
             Feature matrix
         y : pd.Series
             Target variable
@@ -232,38 +336,40 @@ class FeatureEngineeringPipeline:
         Returns
         -------
         list
-            Selected feature names
+            Selected feature names, most important first; integer column
+            positions for array or sparse input
         """
-        X_num = X.select_dtypes(include=[np.number])
+        X_num, columns = self._prepare_numeric(X)
 
-        estimator = RandomForestClassifier(n_estimators=100, random_state=42)
-        selector = RFE(estimator, n_features_to_select=n_features, step=1)
-        selector.fit(X_num, y)
+        estimator = RandomForestClassifier(n_estimators=100, n_jobs=-1,
+                                           random_state=42)
+        estimator.fit(X_num, y)
 
-        selected_mask = selector.get_support()
-        selected_features = X_num.columns[selected_mask].tolist()
+        order = np.argsort(estimator.feature_importances_)[::-1]
+        selected_features = columns[order[:n_features]].tolist()
 
         # Show ranking
         ranking = pd.DataFrame({
-            'feature': X_num.columns,
-            'ranking': selector.ranking_
-        }).sort_values('ranking')
+            'feature': columns[order],
+            'importance': estimator.feature_importances_[order]
+        })
 
-        print("\nFeature rankings (1 = selected):")
+        print("\nFeature importances (top n_features selected):")
         print(ranking.head(15))
 
         return selected_features
 
     def dimensionality_reduction_pca(self, X: pd.DataFrame,
                                     n_components: int = 2,
-                                    plot: bool = True) -> Tuple[np.ndarray, PCA]:
+                                    plot: bool = False) -> Tuple[np.ndarray, PCA]:
         """
         Apply PCA for dimensionality reduction.
 
         Parameters
         ----------
-        X : pd.DataFrame
-            Feature matrix
+        X : pd.DataFrame, np.ndarray or sparse matrix
+            Feature matrix; sparse input is densified, since PCA centres
+            the data
         n_components : int
             Number of principal components
         plot : bool
@@ -274,17 +380,25 @@ class FeatureEngineeringPipeline:
         tuple
             (Transformed data, fitted PCA object)
         """
-        X_num = X.select_dtypes(include=[np.number])
-
-        # Standardize first
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X_num)
-
-        # Apply PCA
-        pca = PCA(n_components=n_components)
+        X_num, _ = self._prepare_numeric(X)
+        if sparse.issparse(X_num):
+            X_num = X_num.toarray()
+
+        # Scale to unit variance in a single copy; PCA centres the data
+        # itself, so subtracting the mean here as well would be a wasted pass
+        X_scaled = np.array(X_num, dtype=float)
+        std = X_scaled.std(axis=0)
+        std[std == 0] = 1.0
+        X_scaled /= std
+
+        # Apply PCA; the randomized solver only computes the leading
+        # n_components directions, O(N p k) instead of a full O(N p^2) SVD
+        pca = PCA(n_components=n_components, svd_solver='randomized',
+                  random_state=0)
         X_pca = pca.fit_transform(X_scaled)
 
         if plot:
+            plt = _pyplot()
             fig, axes = plt.subplots(1, 2, figsize=(14, 5))
 
             # Explained variance
@@ -350,6 +464,7 @@ def demonstrate_missing_values():
         results[name] = df_imputed['income']
 
     # Plot comparison
+    plt = _pyplot()
     fig, axes = plt.subplots(1, 4, figsize=(16, 4))
 
     # Original data (before introducing missing values)
@@ -384,26 +499,35 @@ def demonstrate_encoding():
     print("\nOriginal data sample:")
     print(df.head())
 
-    # 1. Label Encoding
-    le = LabelEncoder()
-    df['city_label'] = le.fit_transform(df['city'])
+    # 1. Label Encoding (sorted codes, as LabelEncoder, in one hashed pass)
+    city_codes, city_levels = pd.factorize(df['city'], sort=True)
+    df['city_label'] = city_codes
 
-    # 2. One-Hot Encoding
-    df_onehot = pd.get_dummies(df, columns=['city', 'education'],
-                               prefix=['city', 'edu'], drop_first=True)
+    # 2. One-Hot Encoding: encode the integer codes straight into a sparse
+    # CSR matrix (dropping the first sorted level, as get_dummies would)
+    edu_codes, edu_levels = pd.factorize(df['education'], sort=True)
+    onehot = OneHotEncoder(drop='first', sparse_output=True,
+                           dtype=np.float32).fit_transform(
+                               np.c_[city_codes, edu_codes])
+    onehot_columns = ([f'city_{c}' for c in city_levels[1:]]
+                      + [f'edu_{e}' for e in edu_levels[1:]])
 
     # 3. Ordinal Encoding (for education)
     education_order = ['HS', 'BS', 'MS', 'PhD']
     ordinal_encoder = OrdinalEncoder(categories=[education_order])
     df['education_ordinal'] = ordinal_encoder.fit_transform(df[['education']])
 
-    # 4. Target Encoding (mean encoding)
-    city_means = df.groupby('city')['salary'].mean()
-    df['city_target_encoded'] = df['city'].map(city_means)
+    # 4. Target Encoding (mean encoding): per-city means from two bincounts
+    # over the label codes
+    salary = df['salary'].to_numpy()
+    city_means = (np.bincount(city_codes, weights=salary)
+                  / np.bincount(city_codes))
+    df['city_target_encoded'] = city_means[city_codes]
 
     print("\nEncoding results:")
     print(f"Label encoding: {df[['city', 'city_label']].head()}")
-    print(f"\nOne-hot encoding columns: {[c for c in df_onehot.columns if 'city_' in c or 'edu_' in c]}")
+    print(f"\nOne-hot encoding columns: {onehot_columns} "
+          f"({onehot.nnz} non-zeros in a {onehot.shape} sparse matrix)")
     print(f"\nOrdinal encoding: {df[['education', 'education_ordinal']].head()}")
     print(f"\nTarget encoding: {df[['city', 'city_target_encoded']].head()}")
 
@@ -429,10 +553,12 @@ def demonstrate_complete_pipeline():
     df['category_A'] = np.random.choice(['cat1', 'cat2', 'cat3'], 1000)
     df['category_B'] = np.random.choice(['low', 'medium', 'high'], 1000)
 
-    # Introduce missing values
-    for col in feature_names[:5]:
-        mask = np.random.random(1000) < 0.1
-        df.loc[mask, col] = np.nan
+    # Introduce missing values in one block assignment (masks are drawn
+    # column by column, as separate per-column draws would be)
+    missing_cols = feature_names[:5]
+    block = df[missing_cols].to_numpy(copy=True)
+    block[np.random.random(block.shape[::-1]).T < 0.1] = np.nan
+    df[missing_cols] = block
 
     print(f"\nDataset shape: {df.shape}")
     print(f"Missing values:\n{df.isnull().sum()[df.isnull().sum() > 0]}")
@@ -456,10 +582,10 @@ def demonstrate_complete_pipeline():
 
     print(f"\nTransformed data shape: {X_train_transformed.shape}")
 
-    # Feature selection
-    X_train_df = pd.DataFrame(X_train_transformed,
-                             columns=range(X_train_transformed.shape[1]))
-    selected_features = fe.select_features_univariate(X_train_df, y_train, k=10)
+    # Feature selection (works on the transformed matrix directly, dense or
+    # sparse, so it is never copied into a DataFrame)
+    selected_features = fe.select_features_univariate(X_train_transformed,
+                                                      y_train, k=10)
 
     # Train model
     clf = RandomForestClassifier(n_estimators=100, random_state=42)
@@ -471,6 +597,7 @@ def demonstrate_complete_pipeline():
         'importance': clf.feature_importances_
     }).sort_values('importance', ascending=False)
 
+    plt = _pyplot()
     plt.figure(figsize=(10, 6))
     plt.bar(range(15), importances.head(15)['importance'])
     plt.xlabel('Feature Index')
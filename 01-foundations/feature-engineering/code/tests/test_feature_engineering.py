@@ -0,0 +1,89 @@
+"""
+Unit tests for the feature engineering pipeline.
+
+Tests for FastMedianImputer and the preprocessing pipeline built on it.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.exceptions import NotFittedError
+from sklearn.impute import SimpleImputer
+
+# The pipeline lives next to this directory, in code/python
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'python'))
+
+from feature_engineering_pipeline import (  # noqa: E402
+    FastMedianImputer, FeatureEngineeringPipeline)
+
+
+# ============================================================================
+# FastMedianImputer Tests
+# ============================================================================
+
+class TestFastMedianImputer:
+    """Test suite for the median imputer."""
+
+    @pytest.fixture
+    def X(self):
+        """Numeric frame with scattered NaNs and one all-NaN column."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 4))
+        X[rng.random(X.shape) < 0.2] = np.nan
+        X[:, 3] = np.nan
+        return pd.DataFrame(X, columns=['a', 'b', 'c', 'empty'])
+
+    def test_matches_simple_imputer(self, X):
+        """Output equals SimpleImputer(strategy='median'), empty columns kept."""
+        expected = SimpleImputer(strategy='median',
+                                 keep_empty_features=True).fit_transform(X)
+        result = FastMedianImputer().fit_transform(X)
+
+        np.testing.assert_allclose(result, expected)
+        assert not np.isnan(result).any()
+
+    def test_feature_names_out(self, X):
+        """Input column names pass through unchanged."""
+        imputer = FastMedianImputer().fit(X)
+        assert list(imputer.get_feature_names_out()) == list(X.columns)
+
+    def test_transform_before_fit_raises(self, X):
+        """Transforming an unfitted imputer raises NotFittedError."""
+        with pytest.raises(NotFittedError):
+            FastMedianImputer().transform(X)
+
+    def test_feature_count_mismatch_raises(self, X):
+        """Transforming a different number of columns raises ValueError."""
+        imputer = FastMedianImputer().fit(X)
+        with pytest.raises(ValueError, match="features"):
+            imputer.transform(X.iloc[:, :2])
+
+
+# ============================================================================
+# Pipeline Tests
+# ============================================================================
+
+class TestFeatureEngineeringPipeline:
+    """Test suite for the preprocessing pipeline."""
+
+    def test_basic_pipeline_feature_names(self):
+        """The fitted pipeline reports one name per output column."""
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame({
+            'x1': rng.normal(size=100),
+            'x2': rng.normal(size=100),
+            'cat': rng.choice(['u', 'v', 'w'], size=100),
+        })
+        df.loc[::7, 'x1'] = np.nan
+
+        fe = FeatureEngineeringPipeline(['x1', 'x2'], ['cat'])
+        preprocessor = fe.create_basic_pipeline().fit(df)
+        out = preprocessor.transform(df)
+        names = preprocessor.get_feature_names_out()
+
+        assert out.shape == (100, len(names))
+        assert list(names[:2]) == ['num__x1', 'num__x2']
+        assert not np.isnan(np.asarray(out[:, :2], dtype=float)).any()
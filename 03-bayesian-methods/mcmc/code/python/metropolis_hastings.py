@@ -17,6 +17,54 @@ import seaborn as sns
 
 sns.set_style("whitegrid")
 
+_MH_LOOP = None
+
+# LLVM fast-math flags without nnan/ninf, so a NaN or -inf log-density is
+# still rejected by the compiled accept test
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+def _get_mh_loop() -> Callable:
+    """
+    Build (once) the Numba-compiled Metropolis-Hastings inner loop.
+
+    Numba is imported lazily so the module stays usable without it. The
+    loop fills a preallocated (total_iterations, dim) buffer in place, so
+    the current row never leaves compiled code.
+
+    The loop takes the compiled log-density as a dispatcher argument,
+    which Numba's on-disk cache cannot key on, so it is not cached: it
+    compiles once per process (and once per distinct log-density).
+
+    Returns
+    -------
+    callable
+        ``_mh_loop(buffer, log_density, proposal_std, rng) -> accepted``
+    """
+    global _MH_LOOP
+    if _MH_LOOP is None:
+        from numba import njit
+
+        @njit(fastmath=_FASTMATH)
+        def _mh_loop(buffer, log_density, proposal_std, rng):
+            n, dim = buffer.shape
+            accepted = 0
+            log_p_current = log_density(buffer[0])
+            for i in range(1, n):
+                current = buffer[i - 1]
+                proposed = current + proposal_std * rng.standard_normal(dim)
+                log_p_proposed = log_density(proposed)
+                if np.log(rng.random()) < log_p_proposed - log_p_current:
+                    buffer[i] = proposed
+                    log_p_current = log_p_proposed
+                    accepted += 1
+                else:
+                    buffer[i] = current
+            return accepted
+
+        _MH_LOOP = _mh_loop
+    return _MH_LOOP
+
 
 class MetropolisHastings:
     """
@@ -35,49 +83,38 @@ class MetropolisHastings:
         self.proposal_std = proposal_std
         self.samples = None
         self.acceptance_rate = None
+        self._compiled_log_density = None
 
-    def propose(self, current_state: np.ndarray) -> np.ndarray:
+    def compile(self, log_density_func: Optional[Callable] = None) -> Callable:
         """
-        Generate proposal using Gaussian random walk.
+        JIT-compile the target log-density with Numba for ``sample_numba``.
 
         Parameters
         ----------
-        current_state : np.ndarray
-            Current state of the chain
+        log_density_func : callable, optional
+            Log-density to compile (defaults to ``target_log_density``).
+            Must only use NumPy features supported by Numba; functions that
+            are already ``numba.njit``-compiled are used as is.
 
         Returns
         -------
-        np.ndarray
-            Proposed next state
+        callable
+            Compiled log-density, stored and reused by ``sample_numba``
         """
-        return current_state + np.random.normal(0, self.proposal_std,
-                                                 size=current_state.shape)
-
-    def acceptance_probability(self, current_state: np.ndarray,
-                               proposed_state: np.ndarray) -> float:
-        """
-        Calculate Metropolis-Hastings acceptance probability.
-
-        For symmetric proposals, this simplifies to min(1, π(x')/π(x))
+        from numba import njit
 
-        Parameters
-        ----------
-        current_state : np.ndarray
-            Current state
-        proposed_state : np.ndarray
-            Proposed state
+        func = (self.target_log_density if log_density_func is None
+                else log_density_func)
+        if not hasattr(func, 'py_func'):
+            func = njit(fastmath=_FASTMATH)(func)
 
-        Returns
-        -------
-        float
-            Acceptance probability
-        """
-        log_ratio = (self.target_log_density(proposed_state) -
-                     self.target_log_density(current_state))
-        return min(1.0, np.exp(log_ratio))
+        self._compiled_log_density = func
+        return func
 
     def sample(self, n_samples: int, initial_state: np.ndarray,
-               burn_in: int = 1000, thin: int = 1) -> np.ndarray:
+               burn_in: int = 1000, thin: int = 1,
+               seed: Optional[int] = None,
+               dtype: np.dtype = np.float64) -> np.ndarray:
         """
         Run the Metropolis-Hastings algorithm.
 
@@ -91,6 +128,12 @@ class MetropolisHastings:
             Number of initial samples to discard
         thin : int, optional
             Thinning interval (keep every thin-th sample)
+        seed : int, optional
+            Seed for the random number generator. ``None`` draws fresh
+            OS entropy, so ``np.random.seed`` has no effect
+        dtype : np.dtype, optional
+            Storage dtype of the returned samples. ``np.float32`` halves the
+            trace footprint; the chain itself is always run in float64.
 
         Returns
         -------
@@ -101,23 +144,39 @@ class MetropolisHastings:
         total_iterations = burn_in + n_samples * thin
 
         # Storage for all samples (including burn-in)
-        all_samples = np.zeros((total_iterations, dim))
+        all_samples = np.zeros((total_iterations, dim), dtype=dtype)
         all_samples[0] = initial_state
 
+        # Live state kept in float64 and only downcast when stored. The
+        # proposal is written into a second buffer and the two are swapped
+        # on acceptance, so the loop allocates nothing.
+        current = np.array(initial_state, dtype=np.float64)
+        proposed = np.empty(dim)
+
         accepted = 0
 
-        for i in range(1, total_iterations):
-            current = all_samples[i-1]
-            proposed = self.propose(current)
+        # Draw every random-walk step and uniform up front in two batched
+        # calls; the loop below only indexes into them
+        rng = np.random.default_rng(seed)
+        steps = rng.standard_normal((total_iterations, dim)) * self.proposal_std
+        log_uniforms = np.log(rng.random(total_iterations))
 
-            # Metropolis-Hastings acceptance step
-            alpha = self.acceptance_probability(current, proposed)
+        # log π of the current state only changes on acceptance
+        log_p_current = self.target_log_density(current)
 
-            if np.random.uniform() < alpha:
-                all_samples[i] = proposed
+        for i in range(1, total_iterations):
+            # Gaussian random walk with pre-drawn steps
+            np.add(current, steps[i], out=proposed)
+            log_p_proposed = self.target_log_density(proposed)
+
+            # Metropolis-Hastings acceptance step, in log space:
+            # u < min(1, π(x')/π(x))  <=>  log u < log π(x') - log π(x)
+            if log_uniforms[i] < log_p_proposed - log_p_current:
+                current, proposed = proposed, current
+                log_p_current = log_p_proposed
                 accepted += 1
-            else:
-                all_samples[i] = current
+
+            all_samples[i] = current
 
         # Calculate acceptance rate
         self.acceptance_rate = accepted / total_iterations
@@ -127,6 +186,189 @@ class MetropolisHastings:
 
         return self.samples
 
+    def _run_one_chain(self, seed: np.random.SeedSequence,
+                       initial_state: np.ndarray, n_samples: int,
+                       burn_in: int, thin: int) -> Tuple[np.ndarray, float]:
+        """Run a single chain and return its samples and acceptance rate."""
+        samples = self.sample(n_samples, initial_state, burn_in=burn_in,
+                              thin=thin, seed=seed)
+        return samples, self.acceptance_rate
+
+    def sample_chains(self, n_chains: int, n_samples: int,
+                      initial_states: np.ndarray, burn_in: int = 1000,
+                      thin: int = 1, seed: Optional[int] = None,
+                      n_jobs: int = -1) -> np.ndarray:
+        """
+        Run independent chains in parallel worker processes.
+
+        Each chain gets its own child seed spawned from ``seed``, so the
+        result is reproducible regardless of how joblib schedules workers.
+
+        Parameters
+        ----------
+        n_chains : int
+            Number of independent chains
+        n_samples : int
+            Number of samples per chain (after burn-in and thinning)
+        initial_states : np.ndarray
+            Initial states, shape (n_chains, dim), or a single (dim,) state
+            shared by all chains
+        burn_in : int, optional
+            Number of initial samples to discard
+        thin : int, optional
+            Thinning interval (keep every thin-th sample)
+        seed : int, optional
+            Root seed for the per-chain random number generators. ``None``
+            draws fresh OS entropy, so ``np.random.seed`` has no effect
+        n_jobs : int, optional
+            Number of worker processes (-1 uses all cores)
+
+        Returns
+        -------
+        np.ndarray
+            Array of samples (n_chains, n_samples, dim). ``self.samples``
+            holds the pooled draws with shape (n_chains * n_samples, dim).
+        """
+        from joblib import Parallel, delayed
+
+        initial_states = np.atleast_2d(initial_states)
+        initial_states = np.broadcast_to(
+            initial_states, (n_chains, initial_states.shape[1]))
+        seeds = np.random.SeedSequence(seed).spawn(n_chains)
+
+        results = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(self._run_one_chain)(s, x0, n_samples, burn_in, thin)
+            for s, x0 in zip(seeds, initial_states))
+
+        chains = np.stack([samples for samples, _ in results])
+        self.acceptance_rate = float(np.mean([rate for _, rate in results]))
+        self.samples = chains.reshape(-1, chains.shape[-1])
+
+        return chains
+
+    def sample_numba(self, n_samples: int, initial_state: np.ndarray,
+                     burn_in: int = 1000, thin: int = 1,
+                     seed: Optional[int] = None) -> np.ndarray:
+        """
+        Run the Metropolis-Hastings algorithm with a Numba-compiled loop.
+
+        ``target_log_density`` is compiled with :meth:`compile` on first use
+        (unless already compiled); it must take a 1-D state array and
+        return a float.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of samples to generate (after burn-in and thinning)
+        initial_state : np.ndarray
+            Initial state of the chain
+        burn_in : int, optional
+            Number of initial samples to discard
+        thin : int, optional
+            Thinning interval (keep every thin-th sample)
+        seed : int, optional
+            Seed for the ``np.random.Generator`` used inside the loop.
+            ``None`` draws fresh OS entropy, so ``np.random.seed`` has no
+            effect
+
+        Returns
+        -------
+        np.ndarray
+            Array of samples (n_samples, dim)
+        """
+        dim = len(initial_state)
+        total_iterations = burn_in + n_samples * thin
+
+        # One contiguous buffer, filled in place by the compiled loop
+        all_samples = np.empty((total_iterations, dim))
+        all_samples[0] = initial_state
+
+        log_density = self._compiled_log_density or self.compile()
+        rng = np.random.default_rng(np.random.SeedSequence(seed))
+        accepted = _get_mh_loop()(all_samples, log_density,
+                                  self.proposal_std, rng)
+
+        self.acceptance_rate = accepted / total_iterations
+        self.samples = all_samples[burn_in::thin]
+
+        return self.samples
+
+    def sample_vectorized(self, n_samples: int, initial_states: np.ndarray,
+                          key=None, burn_in: int = 1000,
+                          thin: int = 1) -> np.ndarray:
+        """
+        Run several Metropolis-Hastings chains in lockstep with JAX.
+
+        The chains are carried as a single (n_chains, dim) state and the
+        log-density is batched with ``jax.vmap``; the whole run is one
+        ``jax.lax.scan`` compiled by XLA. ``target_log_density`` must
+        therefore be written with ``jax.numpy``-compatible operations.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of samples per chain (after burn-in and thinning)
+        initial_states : np.ndarray
+            Initial states, shape (n_chains, dim)
+        key : jax.random.PRNGKey, optional
+            Random key. If not given it is seeded from fresh OS entropy,
+            like ``seed=None`` in the other samplers
+        burn_in : int, optional
+            Number of initial samples to discard
+        thin : int, optional
+            Thinning interval (keep every thin-th sample)
+
+        Returns
+        -------
+        np.ndarray
+            Array of samples (n_chains, n_samples, dim). ``self.samples``
+            holds the pooled draws with shape (n_chains * n_samples, dim).
+        """
+        import jax
+        import jax.numpy as jnp
+
+        initial_states = jnp.atleast_2d(jnp.asarray(initial_states))
+        n_chains, dim = initial_states.shape
+        total_iterations = burn_in + n_samples * thin
+
+        if key is None:
+            key = jax.random.PRNGKey(np.random.default_rng().integers(2**31 - 1))
+
+        log_density = jax.vmap(
+            lambda x: jnp.reshape(self.target_log_density(x), ()))
+        proposal_std = self.proposal_std
+
+        def step(carry, step_key):
+            current, log_p_current = carry
+            key_propose, key_accept = jax.random.split(step_key)
+            proposed = current + proposal_std * jax.random.normal(
+                key_propose, current.shape)
+            log_p_proposed = log_density(proposed)
+
+            u = jax.random.uniform(key_accept, (n_chains,))
+            accept = jnp.log(u) < log_p_proposed - log_p_current
+
+            current = jnp.where(accept[:, None], proposed, current)
+            log_p_current = jnp.where(accept, log_p_proposed, log_p_current)
+            return (current, log_p_current), (current, accept)
+
+        run = jax.jit(lambda carry, keys: jax.lax.scan(step, carry, keys))
+        _, (trace, accepted) = run(
+            (initial_states, log_density(initial_states)),
+            jax.random.split(key, total_iterations - 1))
+
+        # Prepend the initial states: (total_iterations, n_chains, dim)
+        all_samples = np.concatenate(
+            [np.asarray(initial_states)[None], np.asarray(trace)])
+
+        self.acceptance_rate = float(accepted.sum()) / (total_iterations * n_chains)
+
+        # Discard burn-in and apply thinning, then put chains first
+        chains = all_samples[burn_in::thin].transpose(1, 0, 2)
+        self.samples = chains.reshape(-1, dim)
+
+        return chains
+
     def plot_diagnostics(self, true_density: Optional[Callable] = None,
                         dim_to_plot: int = 0):
         """
@@ -254,10 +496,16 @@ def example_mixture_model():
     print("\nExample 3: Sampling from Mixture of Gaussians")
 
     # Mixture of two Gaussians: 0.3*N(-3,1) + 0.7*N(2,1.5)
+    weights = np.array([0.3, 0.7])
+    mus = np.array([-3.0, 2.0])
+    sigmas = np.array([1.0, 1.5])
+    log_norm = np.log(weights) - np.log(sigmas) - 0.5 * np.log(2 * np.pi)
+
+    # log Σ_k w_k N(x | μ_k, σ_k) via log-sum-exp: no underflow in the tails,
+    # and works for scalar or batched x
     def log_density(x):
-        comp1 = 0.3 * stats.norm.pdf(x, -3, 1)
-        comp2 = 0.7 * stats.norm.pdf(x, 2, 1.5)
-        return np.log(comp1 + comp2)
+        log_components = log_norm - 0.5 * ((x[..., None] - mus) / sigmas) ** 2
+        return np.logaddexp.reduce(log_components, axis=-1)
 
     # Run Metropolis-Hastings
     mh = MetropolisHastings(log_density, proposal_std=3.0)
@@ -9,13 +9,187 @@ References:
     Hoffman & Gelman (2014)
 """
 
+import math
 import numpy as np
 import matplotlib.pyplot as plt
-from typing import Callable, Tuple
+from typing import Callable, Optional, Tuple
 import seaborn as sns
 
 sns.set_style("whitegrid")
 
+# LLVM fast-math flags without nnan/ninf, so a divergent (NaN or inf)
+# energy still fails the compiled slice and acceptance tests
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+def _build_tree(q, p, grad, q_prime, grad_prime, log_u, v, j, epsilon, H0,
+                leapfrog, hamiltonian, dot, q_stack, p_stack, delta, rng):
+    """
+    Extend the trajectory by a balanced subtree of 2**j leapfrog steps.
+
+    Iterative form of the recursive BuildTree of Hoffman & Gelman (2014):
+    the leaves are visited in integration order and every inner node is
+    checked for a U-turn as soon as its last leaf is reached. The subtree
+    of height d that ends at leaf t starts at leaf t - 2**d + 1, whose state
+    is kept in row d of ``q_stack`` / ``p_stack`` (shape
+    (max_tree_depth + 1, dim)), so only O(j) states are ever stored. The
+    proposal is drawn uniformly from the valid leaves by reservoir
+    sampling, which selects with the same probabilities as merging subtree
+    proposals with weight n'' / (n' + n''). The code only uses features
+    Numba can compile, so the same function backs the compiled path.
+
+    All states live in caller-owned buffers: the frontier ``q``, ``p`` is
+    integrated in place and the proposal is copied into ``q_prime``, so no
+    arrays are allocated per leaf. The gradient at the frontier travels
+    with it in ``grad``, so each leaf costs one gradient evaluation: the
+    closing half-kick of one step and the opening half-kick of the next
+    share it, and so do successive doublings from the same end.
+
+    Parameters
+    ----------
+    q, p : np.ndarray
+        Frontier state the subtree grows from, advanced in place
+    grad : np.ndarray
+        Gradient of the log density at ``q``, kept up to date in place
+    q_prime, grad_prime : np.ndarray
+        Buffers receiving the proposal from this subtree and its gradient
+    log_u : float
+        Log of the slice variable
+    v : int
+        Direction (+1 forward, -1 backward)
+    j : int
+        Height of the subtree
+    epsilon : float
+        Step size
+    H0 : float
+        Energy at the start of the iteration, computed once by the caller
+    leapfrog, hamiltonian : callable
+        In-place integrator step ``leapfrog(q, p, epsilon, grad)`` and
+        energy function
+    dot : callable
+        Inner product used by the U-turn checks
+    q_stack, p_stack : np.ndarray
+        Workspace for subtree starting states
+    delta : np.ndarray
+        Workspace for the U-turn position differences
+    rng : np.random.Generator
+        Random number generator
+
+    Returns
+    -------
+    n_prime : Number of valid states in subtree
+    s_prime : Stop criterion (1 if should continue, 0 otherwise)
+    alpha : Sum of metropolis acceptance probabilities
+    n_alpha : Number of acceptance probability computations
+    """
+    n_prime = 0
+    alpha = 0.0
+    n_alpha = 0
+
+    for t in range(2 ** j):
+        leapfrog(q, p, v * epsilon, grad)
+        H = hamiltonian(q, p)
+
+        # Metropolis acceptance probability; a NaN energy counts as 0, as
+        # in the batched and JAX paths
+        if not np.isnan(H):
+            alpha += min(1.0, np.exp(-H + H0))
+        n_alpha += 1
+
+        # Slice sampling condition; keep each valid state with prob 1/n'
+        if log_u <= -H:
+            n_prime += 1
+            if rng.random() * n_prime < 1.0:
+                q_prime[:] = q
+                grad_prime[:] = grad
+
+        # Stop on a divergent (very low probability) state
+        if not log_u < 1000 - H:
+            return n_prime, 0, alpha, n_alpha
+
+        # An even leaf t starts the subtrees of heights d with
+        # t % 2**d == 0; an odd one ends those with (t + 1) % 2**d == 0,
+        # which are checked for a U-turn, innermost first. The direction v
+        # is applied to the dot products rather than to delta.
+        d = 1
+        if t % 2 == 0:
+            while d <= j and t % (2 ** d) == 0:
+                q_stack[d] = q
+                p_stack[d] = p
+                d += 1
+        else:
+            while d <= j and (t + 1) % (2 ** d) == 0:
+                np.subtract(q, q_stack[d], delta)
+                if (v * dot(delta, p_stack[d]) < 0
+                        or v * dot(delta, p) < 0):
+                    return n_prime, 0, alpha, n_alpha
+                d += 1
+
+    return n_prime, 1, alpha, n_alpha
+
+
+def _build_numba_kernels(log_density: Callable, grad_log_density: Callable
+                         ) -> Tuple[Callable, Callable, Callable]:
+    """
+    Compile the leapfrog step and Hamiltonian for one target with Numba.
+
+    The kernels close over the already compiled target functions rather
+    than taking them as arguments: Numba treats the closure variables as
+    compile-time constants and inlines the calls, whereas passing jitted
+    functions in from interpreted code adds dispatch cost to every call.
+    Numba is imported lazily so the module stays usable without it.
+
+    Parameters
+    ----------
+    log_density, grad_log_density : callable
+        ``numba.njit``-compiled log density and gradient
+
+    Returns
+    -------
+    Tuple[callable, callable, callable]
+        In-place ``leapfrog(q, p, epsilon, grad)``,
+        ``hamiltonian(q, p) -> float`` and the tree builder
+        ``build_tree(q, p, grad, q_prime, grad_prime, log_u, v, j, epsilon,
+        H0, q_stack, p_stack, delta, rng)`` (see :func:`_build_tree`)
+    """
+    from numba import njit
+
+    @njit(fastmath=_FASTMATH)
+    def leapfrog(q, p, epsilon, grad):
+        # Position update fused into the first momentum loop; grad holds
+        # the gradient at q on entry and at the new q on exit
+        half_step = 0.5 * epsilon
+        for i in range(q.shape[0]):
+            p[i] += half_step * grad[i]
+            q[i] += epsilon * p[i]
+        grad[:] = grad_log_density(q)
+        for i in range(q.shape[0]):
+            p[i] += half_step * grad[i]
+
+    @njit(fastmath=_FASTMATH)
+    def hamiltonian(q, p):
+        return -log_density(q) + 0.5 * np.sum(p * p)
+
+    @njit(fastmath=_FASTMATH)
+    def dot(a, b):
+        # Plain loop rather than np.dot: at small dim this compiles to a
+        # few fused multiply-adds instead of a BLAS call
+        total = 0.0
+        for i in range(a.shape[0]):
+            total += a[i] * b[i]
+        return total
+
+    build_tree_impl = njit(fastmath=_FASTMATH)(_build_tree)
+
+    @njit(fastmath=_FASTMATH)
+    def build_tree(q, p, grad, q_prime, grad_prime, log_u, v, j, epsilon, H0,
+                   q_stack, p_stack, delta, rng):
+        return build_tree_impl(q, p, grad, q_prime, grad_prime, log_u, v, j,
+                               epsilon, H0, leapfrog, hamiltonian, dot,
+                               q_stack, p_stack, delta, rng)
+
+    return leapfrog, hamiltonian, build_tree
+
 
 class NUTS:
     """
@@ -28,133 +202,169 @@ class NUTS:
     ----------
     log_density : callable
         Log of the target density function
-    grad_log_density : callable
-        Gradient of the log density function
+    grad_log_density : callable, optional
+        Gradient of the log density function. May be omitted when
+        ``use_jax=True``, in which case it is derived with ``jax.grad``.
     epsilon : float
         Step size for leapfrog integrator (will be adapted)
     delta : float
         Target acceptance probability for dual averaging
+    use_jax : bool
+        Run :meth:`sample` and :meth:`sample_chains` as one ``jax.jit``-
+        compiled program, vmapped over chains. ``log_density`` must then be
+        written with ``jax.numpy`` for a single (dim,) state.
     """
 
-    def __init__(self, log_density: Callable, grad_log_density: Callable,
-                 epsilon: float = 0.1, delta: float = 0.6):
+    def __init__(self, log_density: Callable,
+                 grad_log_density: Optional[Callable] = None,
+                 epsilon: float = 0.1, delta: float = 0.6,
+                 use_jax: bool = False):
         self.log_density = log_density
         self.grad_log_density = grad_log_density
         self.epsilon = epsilon
         self.delta = delta  # Target acceptance probability
+        self.use_jax = use_jax
         self.samples = None
         self.acceptance_rate = None
-        self.epsilon_history = []
+        self.epsilon_history = np.empty(0)
+        self._kernels = None
+        self._grad_step = None  # scratch for the in-place NumPy leapfrog
+
+        if grad_log_density is None and not use_jax:
+            raise ValueError("grad_log_density is required unless use_jax=True")
+
+    def compile(self) -> Tuple[Callable, Callable, Callable]:
+        """
+        JIT-compile the leapfrog step, Hamiltonian and tree builder with Numba.
+
+        ``log_density`` and ``grad_log_density`` are compiled too and must
+        only use NumPy features supported by Numba; functions that are
+        already ``numba.njit``-compiled are used as is. Afterwards
+        :meth:`leapfrog`, :meth:`hamiltonian` and :meth:`build_tree` run as
+        single compiled calls, so a whole subtree is built without
+        returning to the interpreter.
+
+        Returns
+        -------
+        Tuple[callable, callable, callable]
+            Compiled ``leapfrog``, ``hamiltonian`` and ``build_tree``
+        """
+        from numba import njit
 
-    def leapfrog(self, q: np.ndarray, p: np.ndarray, epsilon: float) -> Tuple[np.ndarray, np.ndarray]:
-        """Single leapfrog step."""
-        p = p + 0.5 * epsilon * self.grad_log_density(q)
-        q = q + epsilon * p
-        p = p + 0.5 * epsilon * self.grad_log_density(q)
+        log_density, grad_log_density = (
+            func if hasattr(func, 'py_func') else njit(fastmath=_FASTMATH)(func)
+            for func in (self.log_density, self.grad_log_density))
+        self._kernels = _build_numba_kernels(log_density, grad_log_density)
+        return self._kernels
+
+    def leapfrog(self, q: np.ndarray, p: np.ndarray, epsilon: float,
+                 grad: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Single leapfrog step, integrated in place.
+
+        ``q`` and ``p`` are overwritten with the new state (and returned);
+        the scaled gradient and step go through one reusable scratch
+        buffer, so a step allocates nothing beyond the gradient itself.
+        If ``grad`` holds the gradient at ``q`` it is used for the first
+        half-kick and overwritten with the gradient at the new position,
+        so consecutive steps evaluate the gradient once each.
+        """
+        if grad is None:
+            grad = np.array(self.grad_log_density(q), dtype=float)
+        if self._kernels is not None:
+            self._kernels[0](q, p, epsilon, grad)
+            return q, p
+
+        step = self._grad_step
+        if step is None or step.shape != q.shape:
+            step = self._grad_step = np.empty(q.shape)
+        np.multiply(grad, 0.5 * epsilon, out=step)
+        p += step
+        np.multiply(p, epsilon, out=step)
+        q += step
+        grad[:] = self.grad_log_density(q)
+        np.multiply(grad, 0.5 * epsilon, out=step)
+        p += step
         return q, p
 
     def hamiltonian(self, q: np.ndarray, p: np.ndarray) -> float:
         """Compute Hamiltonian."""
+        if self._kernels is not None:
+            return self._kernels[1](q, p)
         return -self.log_density(q) + 0.5 * np.sum(p ** 2)
 
-    def find_reasonable_epsilon(self, q: np.ndarray) -> float:
+    def find_reasonable_epsilon(self, q: np.ndarray,
+                                rng: Optional[np.random.Generator] = None) -> float:
         """
         Heuristic for finding a reasonable initial epsilon.
 
         Algorithm 4 from Hoffman & Gelman (2014)
         """
+        rng = np.random.default_rng() if rng is None else rng
         epsilon = 1.0
-        p = np.random.randn(len(q))
-
-        _, p_new = self.leapfrog(q, p, epsilon)
+        p = rng.standard_normal(len(q))
+        H = self.hamiltonian(q, p)
+        grad = np.array(self.grad_log_density(q), dtype=float)
+
+        # Each trial step restarts from (q, p) in these buffers
+        q_new = np.empty(len(q))
+        p_new = np.empty(len(q))
+        grad_new = np.empty(len(q))
+
+        def trial_log_ratio(epsilon):
+            q_new[:] = q
+            p_new[:] = p
+            grad_new[:] = grad
+            self.leapfrog(q_new, p_new, epsilon, grad_new)
+            return -self.hamiltonian(q_new, p_new) + H
 
         # Check if moving in right direction
-        log_ratio = -self.hamiltonian(q, p_new) + self.hamiltonian(q, p)
+        log_ratio = trial_log_ratio(epsilon)
         a = 1.0 if log_ratio > np.log(0.5) else -1.0
 
         # Keep doubling/halving until we cross the acceptance threshold
         while a * log_ratio > -a * np.log(2):
             epsilon = epsilon * (2.0 ** a)
-            _, p_new = self.leapfrog(q, p, epsilon)
-            log_ratio = -self.hamiltonian(q, p_new) + self.hamiltonian(q, p)
+            log_ratio = trial_log_ratio(epsilon)
 
         return epsilon
 
-    def build_tree(self, q, p, u, v, j, epsilon, q0, p0):
+    def build_tree(self, q, p, grad, q_prime, grad_prime, log_u, v, j,
+                   epsilon, H0, q_stack, p_stack, delta, rng):
         """
-        Build a balanced binary tree for candidate states.
+        Build a balanced binary tree of 2**j candidate states.
 
-        Recursively builds a tree of depth j using leapfrog steps.
+        See :func:`_build_tree`; runs compiled after :meth:`compile`. The
+        frontier ``q``, ``p`` and its gradient ``grad`` are advanced in
+        place and the subtree proposal is written to ``q_prime``, with its
+        gradient in ``grad_prime``.
 
         Returns
         -------
-        q_new, p_new : Next position and momentum
-        q_fwd, p_fwd : Forward-most position and momentum
-        q_bwd, p_bwd : Backward-most position and momentum
-        q_prime : Proposal from this subtree
-        p_prime : Momentum for proposal
         n_prime : Number of valid states in subtree
         s_prime : Stop criterion (1 if should continue, 0 otherwise)
         alpha : Sum of metropolis acceptance probabilities
         n_alpha : Number of acceptance probability computations
         """
-        if j == 0:
-            # Base case: single leapfrog step
-            q_new, p_new = self.leapfrog(q, p, v * epsilon)
-            H = self.hamiltonian(q_new, p_new)
-            H0 = self.hamiltonian(q0, p0)
-
-            # Check if valid state (slice sampling condition)
-            n_prime = int(u < np.exp(-H))
-
-            # Check U-turn condition (inner product)
-            s_prime = int((u < np.exp(1000 - H)))  # Avoid numerical issues
-
-            # Metropolis acceptance probability
-            alpha_prime = min(1.0, np.exp(-H + H0))
-            n_alpha_prime = 1
-
-            return (q_new, p_new, q_new, p_new, q_new, p_new, q_new, p_new,
-                    n_prime, s_prime, alpha_prime, n_alpha_prime)
-        else:
-            # Recursion: build left and right subtrees
-            (q_new, p_new, q_fwd, p_fwd, q_bwd, p_bwd, q_prime, p_prime,
-             n_prime, s_prime, alpha_prime, n_alpha_prime) = self.build_tree(
-                q, p, u, v, j-1, epsilon, q0, p0)
-
-            if s_prime == 1:
-                if v == -1:
-                    (q_bwd, p_bwd, _, _, _, _, q_prime2, p_prime2,
-                     n_prime2, s_prime2, alpha_prime2, n_alpha_prime2) = self.build_tree(
-                        q_bwd, p_bwd, u, v, j-1, epsilon, q0, p0)
-                else:
-                    (_, _, q_fwd, p_fwd, _, _, q_prime2, p_prime2,
-                     n_prime2, s_prime2, alpha_prime2, n_alpha_prime2) = self.build_tree(
-                        q_fwd, p_fwd, u, v, j-1, epsilon, q0, p0)
-
-                # Choose proposal from second subtree with probability n_prime2 / (n_prime + n_prime2)
-                if np.random.rand() < n_prime2 / max(n_prime + n_prime2, 1):
-                    q_prime = q_prime2
-                    p_prime = p_prime2
-
-                # Update acceptance probability statistics
-                alpha_prime += alpha_prime2
-                n_alpha_prime += n_alpha_prime2
-
-                # Check U-turn condition
-                delta_fwd = q_fwd - q_bwd
-                s_prime = s_prime2 * int(np.dot(delta_fwd, p_bwd) >= 0) * int(np.dot(delta_fwd, p_fwd) >= 0)
-
-                n_prime = n_prime + n_prime2
-
-            return (q_new, p_new, q_fwd, p_fwd, q_bwd, p_bwd, q_prime, p_prime,
-                    n_prime, s_prime, alpha_prime, n_alpha_prime)
+        if self._kernels is not None:
+            return self._kernels[2](q, p, grad, q_prime, grad_prime, log_u,
+                                    v, j, epsilon, H0, q_stack, p_stack,
+                                    delta, rng)
+        return _build_tree(q, p, grad, q_prime, grad_prime, log_u, v, j,
+                           epsilon, H0, self.leapfrog, self.hamiltonian,
+                           np.dot, q_stack, p_stack, delta, rng)
 
     def sample(self, n_samples: int, initial_state: np.ndarray,
-               burn_in: int = 1000, adapt_steps: int = 1000) -> np.ndarray:
+               burn_in: int = 1000, adapt_steps: int = 1000,
+               seed: Optional[int] = None,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Run NUTS with dual averaging for step size adaptation.
 
+        Only the kept draws are stored: burn-in iterations advance a single
+        state buffer, so memory is O(n_samples * dim) whatever the length
+        of the burn-in.
+
         Parameters
         ----------
         n_samples : int
@@ -165,100 +375,642 @@ class NUTS:
             Number of burn-in iterations
         adapt_steps : int
             Number of steps for epsilon adaptation
+        seed : int, optional
+            Seed for the random number generator. ``None`` draws fresh
+            OS entropy, so ``np.random.seed`` has no effect
+        out : np.ndarray, optional
+            Preallocated (n_samples, dim) array the draws are written into
 
         Returns
         -------
         np.ndarray
-            Array of samples
+            Array of samples (``out`` if it was given)
         """
         dim = len(initial_state)
+        if out is None:
+            out = np.empty((n_samples, dim))
+        elif out.shape != (n_samples, dim):
+            raise ValueError(f"out must have shape {(n_samples, dim)}, got {out.shape}")
+
+        if self.use_jax:
+            chains = self._sample_jax(n_samples, np.asarray(initial_state)[None],
+                                      burn_in, adapt_steps, seed)
+            out[:] = chains[0]
+            self.samples = out
+            self.epsilon = float(self.epsilon[0])
+            self.epsilon_history = self.epsilon_history[:, 0]
+            print(f"Final epsilon: {self.epsilon:.4f}")
+            print(f"Acceptance rate: {self.acceptance_rate:.2%}")
+            return self.samples
+
         total_iterations = burn_in + n_samples
+        rng = np.random.default_rng(seed)
 
         # Find reasonable initial epsilon
-        epsilon = self.find_reasonable_epsilon(initial_state)
+        epsilon = self.find_reasonable_epsilon(initial_state, rng)
         print(f"Initial epsilon: {epsilon:.4f}")
 
-        # Dual averaging parameters
+        # Dual averaging parameters; the adaptation is scalar arithmetic,
+        # so it is done with math rather than NumPy
         gamma = 0.05
         t0 = 10
         kappa = 0.75
-        mu = np.log(10 * epsilon)
+        mu = math.log(10 * epsilon)
 
-        epsilon_bar = 1.0
+        log_epsilon_bar = 0.0
         H_bar = 0.0
 
-        all_samples = np.zeros((total_iterations, dim))
-        all_samples[0] = initial_state
-        self.epsilon_history = [epsilon]
+        # Current state; the trace row for iteration m is out[m - burn_in]
+        q = np.array(initial_state, dtype=float)
+        if burn_in == 0:
+            out[0] = q
+        self.epsilon_history = np.empty(min(adapt_steps, total_iterations - 1) + 1)
+        self.epsilon_history[0] = epsilon
 
         accepted = 0
         max_tree_depth = 10
 
-        for m in range(1, total_iterations):
-            q = all_samples[m-1]
-            p = np.random.randn(dim)
+        # Starting states of the open subtrees, shared by every build_tree
+        q_stack = np.empty((max_tree_depth + 1, dim))
+        p_stack = np.empty((max_tree_depth + 1, dim))
 
-            # Initial slice variable
-            u = np.random.uniform(0, np.exp(-self.hamiltonian(q, p)))
+        # Per-iteration state, allocated once and overwritten in place:
+        # initial momentum, the two trajectory ends, the subtree proposal
+        # and the U-turn difference, plus the gradients at the ends and at
+        # the proposal
+        (p, q_fwd, p_fwd, q_bwd, p_bwd, q_prime, delta,
+         grad_fwd, grad_bwd, grad_prime) = np.empty((10, dim))
 
-            # Initialize tree
-            q_fwd = q_bwd = q_new = q
-            p_fwd = p_bwd = p_new = p
+        # Gradient at the current state, carried over from the accepted
+        # proposal so each iteration starts without a gradient call
+        grad = np.array(self.grad_log_density(q), dtype=float)
+
+        for m in range(1, total_iterations):
+            rng.standard_normal(out=p)
+
+            # Initial slice variable u ~ Uniform(0, exp(-H0)), drawn as
+            # log u so it cannot underflow for large energies; the starting
+            # energy is shared by every leaf of this iteration's trajectory
+            H0 = self.hamiltonian(q, p)
+            log_u = -H0 - rng.exponential()
+
+            # Initialize tree; the trajectory ends are copies, so accepted
+            # proposals are written straight into the current state
+            q_fwd[:] = q
+            q_bwd[:] = q
+            p_fwd[:] = p
+            p_bwd[:] = p
+            grad_fwd[:] = grad
+            grad_bwd[:] = grad
             j = 0  # Tree depth
             n = 1  # Number of valid states
             s = 1  # Stop criterion
 
             while s == 1 and j < max_tree_depth:
                 # Choose direction
-                v = int(2 * (np.random.rand() < 0.5) - 1)
+                v = int(2 * (rng.random() < 0.5) - 1)
 
                 if v == -1:
-                    (q_bwd, p_bwd, _, _, _, _, q_prime, p_prime,
-                     n_prime, s_prime, alpha, n_alpha) = self.build_tree(
-                        q_bwd, p_bwd, u, v, j, epsilon, q, p)
+                    n_prime, s_prime, alpha, n_alpha = self.build_tree(
+                        q_bwd, p_bwd, grad_bwd, q_prime, grad_prime, log_u,
+                        v, j, epsilon, H0, q_stack, p_stack, delta, rng)
                 else:
-                    (_, _, q_fwd, p_fwd, _, _, q_prime, p_prime,
-                     n_prime, s_prime, alpha, n_alpha) = self.build_tree(
-                        q_fwd, p_fwd, u, v, j, epsilon, q, p)
+                    n_prime, s_prime, alpha, n_alpha = self.build_tree(
+                        q_fwd, p_fwd, grad_fwd, q_prime, grad_prime, log_u,
+                        v, j, epsilon, H0, q_stack, p_stack, delta, rng)
 
                 if s_prime == 1:
                     # Accept proposal with probability n_prime / n
-                    if np.random.rand() < min(1, n_prime / n):
-                        q_new = q_prime
+                    if rng.random() < min(1, n_prime / n):
+                        q[:] = q_prime
+                        grad[:] = grad_prime
                         accepted += 1
 
                 # Update number of valid states
                 n = n + n_prime
 
                 # Check U-turn condition
-                delta = q_fwd - q_bwd
+                np.subtract(q_fwd, q_bwd, out=delta)
                 s = s_prime * int(np.dot(delta, p_bwd) >= 0) * int(np.dot(delta, p_fwd) >= 0)
 
                 j += 1
 
-            all_samples[m] = q_new
+            if m >= burn_in:
+                out[m - burn_in] = q
 
             # Adapt epsilon during burn-in
             if m <= adapt_steps:
                 # Dual averaging
                 H_bar = (1 - 1/(m + t0)) * H_bar + (1/(m + t0)) * (self.delta - alpha/n_alpha)
-                log_epsilon = mu - (np.sqrt(m) / gamma) * H_bar
-                epsilon = np.exp(log_epsilon)
+                log_epsilon = mu - (math.sqrt(m) / gamma) * H_bar
+                epsilon = math.exp(log_epsilon)
 
-                epsilon_bar = np.exp(m**(-kappa) * log_epsilon + (1 - m**(-kappa)) * np.log(epsilon_bar))
-                self.epsilon_history.append(epsilon)
-            else:
-                epsilon = epsilon_bar
+                m_pow = m**(-kappa)
+                log_epsilon_bar = m_pow * log_epsilon + (1 - m_pow) * log_epsilon_bar
+                self.epsilon_history[m] = epsilon
+            elif m == adapt_steps + 1:
+                epsilon = math.exp(log_epsilon_bar)
 
         self.acceptance_rate = accepted / total_iterations
-        self.samples = all_samples[burn_in:]
-        self.epsilon = epsilon_bar
+        self.samples = out
+        self.epsilon = math.exp(log_epsilon_bar)
 
         print(f"Final epsilon: {self.epsilon:.4f}")
         print(f"Acceptance rate: {self.acceptance_rate:.2%}")
 
         return self.samples
 
+    def _batched_leapfrog(self, q: np.ndarray, p: np.ndarray,
+                          step: np.ndarray, grad: np.ndarray) -> None:
+        """
+        Leapfrog step for a batch of chains, in place.
+
+        ``q``, ``p`` are (n_chains, dim) and ``step`` holds the signed step
+        size of every chain as an (n_chains, 1) column. ``grad`` holds the
+        gradients at ``q`` and is updated to those at the new positions.
+        """
+        p += 0.5 * step * grad
+        q += step * p
+        grad[:] = self.grad_log_density(q)
+        p += 0.5 * step * grad
+
+    def _batched_hamiltonian(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """Hamiltonian of every chain in a (n_chains, dim) batch."""
+        return -self.log_density(q) + 0.5 * np.einsum('ij,ij->i', p, p)
+
+    def _batched_reasonable_epsilon(self, q: np.ndarray,
+                                    rng: np.random.Generator) -> np.ndarray:
+        """
+        :meth:`find_reasonable_epsilon` for every chain of a batch at once.
+
+        Chains whose step size has crossed the acceptance threshold are
+        frozen while the others keep doubling or halving.
+        """
+        n_chains = q.shape[0]
+        p = rng.standard_normal(q.shape)
+        H = self._batched_hamiltonian(q, p)
+        grad = np.array(self.grad_log_density(q), dtype=float)
+
+        def trial_log_ratio(epsilon):
+            q_new, p_new = q.copy(), p.copy()
+            self._batched_leapfrog(q_new, p_new, epsilon[:, None], grad.copy())
+            return -self._batched_hamiltonian(q_new, p_new) + H
+
+        epsilon = np.ones(n_chains)
+        log_ratio = trial_log_ratio(epsilon)
+        a = np.where(log_ratio > np.log(0.5), 1.0, -1.0)
+
+        searching = a * log_ratio > -a * np.log(2)
+        while searching.any():
+            epsilon = np.where(searching, epsilon * 2.0 ** a, epsilon)
+            log_ratio = np.where(searching, trial_log_ratio(epsilon), log_ratio)
+            searching &= a * log_ratio > -a * np.log(2)
+
+        return epsilon
+
+    def sample_chains(self, n_samples: int, initial_states: np.ndarray,
+                      burn_in: int = 1000, adapt_steps: int = 1000,
+                      seed: Optional[int] = None) -> np.ndarray:
+        """
+        Run several NUTS chains in lockstep as one batch.
+
+        Every chain carries its own trajectory, slice variable and dual
+        averaging state, but all chains advance together: each leapfrog
+        step, energy and U-turn test is one vectorized operation over the
+        leading chain axis, with finished chains masked out. At small dim
+        this spreads NumPy's per-call cost over all chains.
+
+        ``log_density`` must map a (n_chains, dim) batch to (n_chains,)
+        values and ``grad_log_density`` to (n_chains, dim) gradients. With
+        ``use_jax=True`` both are written for a single state instead and
+        batched by ``jax.vmap``.
+
+        Parameters
+        ----------
+        n_samples : int
+            Number of samples to generate per chain
+        initial_states : np.ndarray
+            Initial states (n_chains, dim)
+        burn_in : int
+            Number of burn-in iterations
+        adapt_steps : int
+            Number of steps for epsilon adaptation
+        seed : int, optional
+            Seed for the random number generator. ``None`` draws fresh
+            OS entropy, so ``np.random.seed`` has no effect
+
+        Returns
+        -------
+        np.ndarray
+            Samples (n_chains, n_samples, dim). ``self.samples`` holds the
+            pooled draws (n_chains * n_samples, dim), ``self.epsilon``
+            the adapted step size of each chain and ``self.epsilon_history``
+            the step sizes during adaptation (adapt_steps + 1, n_chains).
+        """
+        initial_states = np.asarray(initial_states, dtype=float)
+        n_chains, dim = initial_states.shape
+
+        if self.use_jax:
+            chains = self._sample_jax(n_samples, initial_states, burn_in,
+                                      adapt_steps, seed)
+            self.samples = chains.reshape(-1, dim)
+            print(f"Final epsilon (mean over chains): {self.epsilon.mean():.4f}")
+            print(f"Acceptance rate: {self.acceptance_rate:.2%}")
+            return chains
+
+        total_iterations = burn_in + n_samples
+        rng = np.random.default_rng(seed)
+        max_tree_depth = 10
+
+        epsilon = self._batched_reasonable_epsilon(initial_states, rng)
+
+        # Dual averaging state, one entry per chain
+        gamma, t0, kappa = 0.05, 10, 0.75
+        mu = np.log(10 * epsilon)
+        log_epsilon_bar = np.zeros(n_chains)
+        H_bar = np.zeros(n_chains)
+
+        # Current states; the trace row for iteration m is out[m - burn_in]
+        q_cur = initial_states.copy()
+        out = np.empty((n_samples, n_chains, dim))
+        if burn_in == 0:
+            out[0] = q_cur
+        self.epsilon_history = np.empty((min(adapt_steps, total_iterations - 1) + 1,
+                                         n_chains))
+        self.epsilon_history[0] = epsilon
+        accepted = 0
+
+        # Subtree starting states, for every chain
+        q_stack = np.empty((max_tree_depth + 1, n_chains, dim))
+        p_stack = np.empty((max_tree_depth + 1, n_chains, dim))
+
+        # Gradients at the current states, carried with accepted proposals
+        grad0 = np.array(self.grad_log_density(initial_states), dtype=float)
+
+        for m in range(1, total_iterations):
+            q0 = q_cur
+            p0 = rng.standard_normal((n_chains, dim))
+            H0 = self._batched_hamiltonian(q0, p0)
+            log_u = -H0 - rng.exponential(size=n_chains)
+
+            q_fwd, q_bwd = q0.copy(), q0.copy()
+            p_fwd, p_bwd = p0.copy(), p0.copy()
+            grad_fwd, grad_bwd = grad0.copy(), grad0.copy()
+            # Trajectory ends are copies, so accepted proposals are written
+            # straight into the current states
+            q_new = q_cur
+            n = np.ones(n_chains)
+            s = np.ones(n_chains, dtype=bool)
+            alpha = np.zeros(n_chains)
+            n_alpha = np.zeros(n_chains)
+            j = 0
+
+            while s.any() and j < max_tree_depth:
+                # Only chains still running take part in this doubling
+                idx = np.flatnonzero(s)
+                v = np.where(rng.random(idx.size) < 0.5, -1.0, 1.0)
+                forward = v > 0
+                step = (v * epsilon[idx])[:, None]
+                H0_sub = H0[idx]
+                log_u_sub = log_u[idx]
+
+                # Grow each chain's subtree from its end in direction v
+                q = np.where(forward[:, None], q_fwd[idx], q_bwd[idx])
+                p = np.where(forward[:, None], p_fwd[idx], p_bwd[idx])
+                grad = np.where(forward[:, None], grad_fwd[idx], grad_bwd[idx])
+                q_prime, grad_prime = q.copy(), grad.copy()
+                n_prime = np.zeros(idx.size)
+                alive = np.ones(idx.size, dtype=bool)
+                alpha_sub = np.zeros(idx.size)
+                n_alpha_sub = np.zeros(idx.size)
+
+                with np.errstate(over='ignore', invalid='ignore'):
+                    for t in range(2 ** j):
+                        self._batched_leapfrog(q, p, step, grad)
+                        H = self._batched_hamiltonian(q, p)
+
+                        # A NaN energy counts as 0 acceptance, so it cannot
+                        # reach H_bar and turn the step size into NaN
+                        alpha_sub += np.where(
+                            alive & ~np.isnan(H),
+                            np.minimum(1.0, np.exp(H0_sub - H)), 0.0)
+                        n_alpha_sub += alive
+
+                        # Reservoir-sample the proposal among valid leaves
+                        valid = alive & (log_u_sub <= -H)
+                        n_prime += valid
+                        take = valid & (rng.random(idx.size) * n_prime < 1.0)
+                        q_prime[take] = q[take]
+                        grad_prime[take] = grad[take]
+
+                        # Divergence
+                        alive &= log_u_sub < 1000 - H
+
+                        # Inner U-turn checks, as in _build_tree
+                        d = 1
+                        if t % 2 == 0:
+                            while d <= j and t % (2 ** d) == 0:
+                                q_stack[d, idx] = q
+                                p_stack[d, idx] = p
+                                d += 1
+                        else:
+                            while d <= j and (t + 1) % (2 ** d) == 0:
+                                delta = q - q_stack[d, idx]
+                                alive &= (v * np.einsum('ij,ij->i', delta, p_stack[d, idx]) >= 0)
+                                alive &= (v * np.einsum('ij,ij->i', delta, p) >= 0)
+                                d += 1
+
+                        if not alive.any():
+                            break
+
+                # Adaptation uses each chain's most recent subtree
+                alpha[idx] = alpha_sub
+                n_alpha[idx] = n_alpha_sub
+                q_fwd[idx] = np.where(forward[:, None], q, q_fwd[idx])
+                p_fwd[idx] = np.where(forward[:, None], p, p_fwd[idx])
+                q_bwd[idx] = np.where(forward[:, None], q_bwd[idx], q)
+                p_bwd[idx] = np.where(forward[:, None], p_bwd[idx], p)
+                grad_fwd[idx] = np.where(forward[:, None], grad, grad_fwd[idx])
+                grad_bwd[idx] = np.where(forward[:, None], grad_bwd[idx], grad)
+
+                # Accept proposal with probability n_prime / n
+                take = alive & (rng.random(idx.size) < np.minimum(1, n_prime / n[idx]))
+                q_new[idx[take]] = q_prime[take]
+                grad0[idx[take]] = grad_prime[take]
+                accepted += int(take.sum())
+                n[idx] += n_prime
+
+                # Check U-turn condition over the whole trajectory
+                delta = q_fwd[idx] - q_bwd[idx]
+                s[idx] = (alive
+                          & (np.einsum('ij,ij->i', delta, p_bwd[idx]) >= 0)
+                          & (np.einsum('ij,ij->i', delta, p_fwd[idx]) >= 0))
+
+                j += 1
+
+            if m >= burn_in:
+                out[m - burn_in] = q_cur
+
+            # Adapt epsilon during burn-in
+            if m <= adapt_steps:
+                # Dual averaging
+                H_bar = (1 - 1/(m + t0)) * H_bar + (1/(m + t0)) * (self.delta - alpha/n_alpha)
+                log_epsilon = mu - (np.sqrt(m) / gamma) * H_bar
+                epsilon = np.exp(log_epsilon)
+
+                log_epsilon_bar = m**(-kappa) * log_epsilon + (1 - m**(-kappa)) * log_epsilon_bar
+                self.epsilon_history[m] = epsilon
+            else:
+                epsilon = np.exp(log_epsilon_bar)
+
+        self.acceptance_rate = accepted / (total_iterations * n_chains)
+        self.epsilon = np.exp(log_epsilon_bar)
+
+        chains = out.transpose(1, 0, 2)
+        self.samples = chains.reshape(-1, dim)
+
+        print(f"Final epsilon (mean over chains): {self.epsilon.mean():.4f}")
+        print(f"Acceptance rate: {self.acceptance_rate:.2%}")
+
+        return chains
+
+
+    def _build_jax_transition(self, max_tree_depth: int) -> Tuple[Callable, Callable]:
+        """
+        Build one NUTS transition and the initial step-size search as
+        traceable JAX functions of a single chain.
+
+        The trajectory doublings run in a ``jax.lax.while_loop`` and each
+        subtree is the leaf-by-leaf iteration of :func:`_build_tree` in an
+        inner ``while_loop``: the open subtree starts live in a
+        (max_tree_depth + 1, dim) stack and the inner U-turn checks of one
+        leaf are a single masked test over all depths, so the whole tree
+        compiles without data-dependent Python branching.
+
+        Returns
+        -------
+        Tuple[callable, callable]
+            ``transition(q, grad, key, epsilon) ->
+            (q, grad, accept_stat, accepted)`` and
+            ``reasonable_epsilon(q, key) -> epsilon``
+        """
+        import jax
+        import jax.numpy as jnp
+
+        log_density = self.log_density
+        if self.grad_log_density is None:
+            self.grad_log_density = jax.grad(log_density)
+        grad_log_density = self.grad_log_density
+
+        depths = jnp.arange(max_tree_depth + 1)
+        subtree_sizes = 2 ** depths
+
+        def leapfrog(q, p, grad, step):
+            # grad is the gradient at q; the one at the new q is returned
+            # for the next step to reuse
+            p = p + 0.5 * step * grad
+            q = q + step * p
+            grad = grad_log_density(q)
+            p = p + 0.5 * step * grad
+            return q, p, grad
+
+        def hamiltonian(q, p):
+            return -log_density(q) + 0.5 * p @ p
+
+        def build_tree(q, p, grad, log_u, H0, v, j, epsilon, key):
+            n_leaves = jnp.left_shift(1, j)
+            inner = (depths >= 1) & (depths <= j)
+
+            def cond(carry):
+                t, alive = carry[0], carry[7]
+                return alive & (t < n_leaves)
+
+            def body(carry):
+                (t, q, p, grad, q_prime, grad_prime, n_prime, alive, alpha,
+                 n_alpha, q_stack, p_stack, key) = carry
+                key, key_take = jax.random.split(key)
+                q, p, grad = leapfrog(q, p, grad, v * epsilon)
+                H = hamiltonian(q, p)
+
+                alpha = alpha + jnp.where(jnp.isnan(H), 0.0,
+                                          jnp.minimum(1.0, jnp.exp(H0 - H)))
+                n_alpha = n_alpha + 1
+
+                # Reservoir-sample the proposal among valid leaves
+                valid = log_u <= -H
+                n_prime = n_prime + valid
+                take = valid & (jax.random.uniform(key_take) * n_prime < 1.0)
+                q_prime = jnp.where(take, q, q_prime)
+                grad_prime = jnp.where(take, grad, grad_prime)
+
+                # Divergence
+                alive = log_u < 1000 - H
+
+                # Inner U-turn checks of every subtree ending at leaf t,
+                # then record leaf t as the start of every subtree it opens
+                delta = q - q_stack
+                turning = ((v * (delta @ p) < 0)
+                           | (v * jnp.sum(delta * p_stack, axis=1) < 0))
+                alive = alive & ~jnp.any(inner & ((t + 1) % subtree_sizes == 0)
+                                         & turning)
+                opens = (inner & (t % subtree_sizes == 0))[:, None]
+                q_stack = jnp.where(opens, q, q_stack)
+                p_stack = jnp.where(opens, p, p_stack)
+
+                return (t + 1, q, p, grad, q_prime, grad_prime, n_prime, alive,
+                        alpha, n_alpha, q_stack, p_stack, key)
+
+            stack = jnp.zeros((max_tree_depth + 1,) + q.shape, q.dtype)
+            zero = jnp.zeros((), q.dtype)
+            init = (0, q, p, grad, q, grad, zero, True, zero, zero, stack,
+                    stack, key)
+            return jax.lax.while_loop(cond, body, init)[1:10]
+
+        def transition(q0, grad0, key, epsilon):
+            key, key_momentum, key_slice = jax.random.split(key, 3)
+            p0 = jax.random.normal(key_momentum, q0.shape, q0.dtype)
+            H0 = hamiltonian(q0, p0)
+            log_u = -H0 - jax.random.exponential(key_slice, dtype=q0.dtype)
+
+            def cond(carry):
+                j, s = carry[0], carry[1]
+                return s & (j < max_tree_depth)
+
+            def body(carry):
+                (j, s, fwd, bwd, q_new, grad_new, n, alpha, n_alpha,
+                 accepted, key) = carry
+                key, key_direction, key_tree, key_accept = jax.random.split(key, 4)
+
+                # Choose direction and grow the subtree from that end
+                v = jnp.where(jax.random.uniform(key_direction) < 0.5, -1.0, 1.0)
+                forward = v > 0
+                # Each end is a (q, p, grad) triple
+                end = [jnp.where(forward, f, b) for f, b in zip(fwd, bwd)]
+                (q, p, grad, q_prime, grad_prime, n_prime, alive, alpha,
+                 n_alpha) = build_tree(*end, log_u, H0, v, j, epsilon, key_tree)
+                fwd = tuple(jnp.where(forward, x, f) for x, f in zip((q, p, grad), fwd))
+                bwd = tuple(jnp.where(forward, b, x) for x, b in zip((q, p, grad), bwd))
+
+                # Accept proposal with probability n_prime / n
+                take = alive & (jax.random.uniform(key_accept)
+                                < jnp.minimum(1.0, n_prime / n))
+                q_new = jnp.where(take, q_prime, q_new)
+                grad_new = jnp.where(take, grad_prime, grad_new)
+                n = n + n_prime
+
+                # Check U-turn condition over the whole trajectory
+                delta = fwd[0] - bwd[0]
+                s = alive & (delta @ bwd[1] >= 0) & (delta @ fwd[1] >= 0)
+
+                return (j + 1, s, fwd, bwd, q_new, grad_new, n, alpha, n_alpha,
+                        accepted + take, key)
+
+            one, zero = jnp.ones((), q0.dtype), jnp.zeros((), q0.dtype)
+            start = (q0, p0, grad0)
+            init = (0, True, start, start, q0, grad0, one, zero, one, 0, key)
+            (_, _, _, _, q_new, grad_new, _, alpha, n_alpha, accepted, _) = (
+                jax.lax.while_loop(cond, body, init))
+            return q_new, grad_new, alpha / n_alpha, accepted
+
+        def reasonable_epsilon(q, key):
+            p = jax.random.normal(key, q.shape, q.dtype)
+            H = hamiltonian(q, p)
+            grad = grad_log_density(q)
+
+            def trial_log_ratio(epsilon):
+                return -hamiltonian(*leapfrog(q, p, grad, epsilon)[:2]) + H
+
+            epsilon = jnp.ones((), q.dtype)
+            log_ratio = trial_log_ratio(epsilon)
+            a = jnp.where(log_ratio > jnp.log(0.5), 1.0, -1.0)
+
+            def cond(carry):
+                return a * carry[1] > -a * jnp.log(2.0)
+
+            def body(carry):
+                epsilon = carry[0] * 2.0 ** a
+                return epsilon, trial_log_ratio(epsilon)
+
+            return jax.lax.while_loop(cond, body, (epsilon, log_ratio))[0]
+
+        return transition, reasonable_epsilon
+
+    def _sample_jax(self, n_samples: int, initial_states: np.ndarray,
+                    burn_in: int, adapt_steps: int,
+                    seed: Optional[int] = None) -> np.ndarray:
+        """
+        Run all chains as a single ``jax.lax.scan`` over iterations.
+
+        The per-chain transition and dual averaging are ``jax.vmap``-ed over
+        the leading chain axis and fused with the scan into one compiled
+        XLA program, so the sampler never returns to Python. The random key
+        is seeded from ``np.random.default_rng(seed)``, so ``seed=None``
+        draws fresh OS entropy as in the NumPy path.
+
+        Returns
+        -------
+        np.ndarray
+            Samples (n_chains, n_samples, dim); ``self.epsilon`` and
+            ``self.epsilon_history`` hold per-chain step sizes.
+        """
+        import jax
+        import jax.numpy as jnp
+
+        n_chains = initial_states.shape[0]
+        total_iterations = burn_in + n_samples
+        max_tree_depth = 10
+        transition, reasonable_epsilon = self._build_jax_transition(max_tree_depth)
+        transition = jax.vmap(transition)
+        grad_log_density = self.grad_log_density
+        target_accept = self.delta
+
+        # Dual averaging parameters
+        gamma, t0, kappa = 0.05, 10, 0.75
+
+        def step(carry, xs):
+            q, grad, epsilon, mu, log_eps_bar, H_bar, accepted = carry
+            key, m = xs
+            q, grad, accept_stat, took = transition(
+                q, grad, jax.random.split(key, n_chains), epsilon)
+
+            # Dual averaging, applied only for the first adapt_steps
+            adapting = m <= adapt_steps
+            H_bar_new = (1 - 1/(m + t0)) * H_bar + (target_accept - accept_stat) / (m + t0)
+            log_eps = mu - (jnp.sqrt(m) / gamma) * H_bar_new
+            log_eps_bar_new = m**(-kappa) * log_eps + (1 - m**(-kappa)) * log_eps_bar
+            H_bar = jnp.where(adapting, H_bar_new, H_bar)
+            log_eps_bar = jnp.where(adapting, log_eps_bar_new, log_eps_bar)
+            epsilon = jnp.exp(jnp.where(adapting, log_eps, log_eps_bar))
+
+            return ((q, grad, epsilon, mu, log_eps_bar, H_bar, accepted + took),
+                    (q, epsilon))
+
+        def run(q0, key):
+            key, key_init = jax.random.split(key)
+            epsilon = jax.vmap(reasonable_epsilon)(
+                q0, jax.random.split(key_init, n_chains))
+            zeros = jnp.zeros(n_chains, q0.dtype)
+            init = (q0, jax.vmap(grad_log_density)(q0), epsilon,
+                    jnp.log(10 * epsilon), zeros, zeros,
+                    jnp.zeros(n_chains, jnp.int32))
+            carry, (trace, history) = jax.lax.scan(
+                step, init, (jax.random.split(key, total_iterations - 1),
+                             jnp.arange(1, total_iterations, dtype=q0.dtype)))
+            return trace, epsilon, history, carry[4], carry[6]
+
+        q0 = jnp.asarray(initial_states)
+        key = jax.random.PRNGKey(np.random.default_rng(seed).integers(2**31 - 1))
+        trace, epsilon0, history, log_eps_bar, accepted = jax.jit(run)(q0, key)
+
+        self.epsilon_history = np.concatenate(
+            [np.asarray(epsilon0)[None], np.asarray(history)[:adapt_steps]]
+        ).astype(float)
+        self.epsilon = np.exp(np.asarray(log_eps_bar, dtype=float))
+        self.acceptance_rate = float(accepted.sum()) / (total_iterations * n_chains)
+
+        all_samples = np.concatenate([initial_states[None], np.asarray(trace)])
+        return all_samples[burn_in:].transpose(1, 0, 2)
+
 
 def example_2d_gaussian():
     """Example: NUTS on a 2D Gaussian."""
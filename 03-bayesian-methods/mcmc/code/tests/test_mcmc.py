@@ -4,19 +4,57 @@ Unit tests for MCMC implementations.
 Tests for Metropolis-Hastings, Hamiltonian Monte Carlo, and NUTS samplers.
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import pytest
 from scipy import stats
 
+# The samplers live next to this directory, in code/python
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'python'))
+
+from affine_invariant_ensemble import AffineInvariantEnsemble  # noqa: E402
+from hamiltonian_mc import HamiltonianMC  # noqa: E402
+from metropolis_hastings import MetropolisHastings  # noqa: E402
+from nuts_sampler import NUTS  # noqa: E402
+
 
 # ============================================================================
 # Test Utilities
 # ============================================================================
 
+def autocorrelation_fft(samples):
+    """
+    Compute the normalized autocorrelation function via FFT.
+
+    Zero-padding to 2n turns the circular correlation into a linear one,
+    giving the same result as ``np.correlate`` in O(n log n).
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        MCMC samples
+
+    Returns
+    -------
+    acf : np.ndarray
+        Autocorrelation at lags 0..n-1
+    """
+    n = len(samples)
+    samples_centered = samples - np.mean(samples)
+    f = np.fft.rfft(samples_centered, 2 * n)
+    acov = np.fft.irfft(np.abs(f) ** 2)[:n]
+    return acov / acov[0]
+
+
 def effective_sample_size(samples):
     """
     Compute effective sample size using autocorrelation.
 
+    Uses Geyer's initial positive sequence: autocorrelations are summed in
+    consecutive pairs until the first non-positive pair.
+
     Parameters
     ----------
     samples : np.ndarray
@@ -31,16 +69,15 @@ def effective_sample_size(samples):
     if n < 2:
         return n
 
-    # Center samples
-    samples_centered = samples - np.mean(samples)
+    acf = autocorrelation_fft(samples)
 
-    # Compute autocorrelation
-    acf = np.correlate(samples_centered, samples_centered, mode='full')
-    acf = acf[len(acf)//2:] / acf[len(acf)//2]
+    # Pair sums Γ_k = ρ_{2k} + ρ_{2k+1}, truncated at the first Γ_k <= 0
+    pair_sums = acf[:2 * (n // 2)].reshape(-1, 2).sum(axis=1)
+    non_positive = np.flatnonzero(pair_sums <= 0)
+    k = non_positive[0] if len(non_positive) else len(pair_sums)
 
-    # Sum until negative
-    ess_inv = 1 + 2 * np.sum(acf[1:][acf[1:] > 0])
-    ess = n / ess_inv
+    tau = -1 + 2 * np.sum(pair_sums[:k])
+    ess = n / tau
 
     return max(ess, 1.0)
 
@@ -78,6 +115,48 @@ def gelman_rubin(chains):
     return r_hat
 
 
+MU = np.array([1.0, -2.0])
+
+
+def gaussian_log_density(x):
+    """
+    Log-density of N(MU, I), for one state or a (n, dim) batch.
+
+    Only uses array methods, so the same function runs under NumPy, Numba
+    and JAX.
+    """
+    d = x - MU
+    return -0.5 * (d * d).sum(axis=-1)
+
+
+def gaussian_grad_log_density(x):
+    """Gradient of ``gaussian_log_density``."""
+    return MU - x
+
+
+def assert_matches_moments(samples, reference, tol=0.1):
+    """
+    Check that draws match a reference run and the target in mean and std.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        Draws to check, any shape ending in dim (chains are pooled)
+    reference : np.ndarray
+        Draws from the reference sampler, (n, dim)
+    tol : float
+        Absolute tolerance on every mean and standard deviation
+    """
+    samples = np.asarray(samples).reshape(-1, len(MU))
+    for draws in (samples, reference):
+        np.testing.assert_allclose(draws.mean(axis=0), MU, atol=tol)
+        np.testing.assert_allclose(draws.std(axis=0), 1.0, atol=tol)
+    np.testing.assert_allclose(samples.mean(axis=0), reference.mean(axis=0),
+                               atol=tol)
+    np.testing.assert_allclose(samples.std(axis=0), reference.std(axis=0),
+                               atol=tol)
+
+
 # ============================================================================
 # Metropolis-Hastings Tests
 # ============================================================================
@@ -135,6 +214,50 @@ class TestMetropolisHastings:
         # Placeholder for input validation tests
         pass
 
+    @pytest.fixture(scope="class")
+    def reference_samples(self):
+        """Draws from the plain NumPy sampler."""
+        mh = MetropolisHastings(gaussian_log_density, proposal_std=1.0)
+        return mh.sample(20000, np.zeros(2), burn_in=1000, seed=0)
+
+    def test_sample_numba_matches_sample(self, reference_samples):
+        """The Numba-compiled loop targets the same distribution."""
+        pytest.importorskip("numba")
+        mh = MetropolisHastings(gaussian_log_density, proposal_std=1.0)
+        samples = mh.sample_numba(20000, np.zeros(2), burn_in=1000, seed=1)
+
+        assert samples.shape == (20000, 2)
+        assert 0.2 < mh.acceptance_rate < 0.6
+        assert_matches_moments(samples, reference_samples)
+
+    def test_sample_vectorized_matches_sample(self, reference_samples):
+        """The JAX lockstep chains target the same distribution."""
+        jax = pytest.importorskip("jax")
+        mh = MetropolisHastings(gaussian_log_density, proposal_std=1.0)
+        chains = mh.sample_vectorized(5000, np.zeros((4, 2)),
+                                      key=jax.random.PRNGKey(2), burn_in=1000)
+
+        assert chains.shape == (4, 5000, 2)
+        assert mh.samples.shape == (20000, 2)
+        assert_matches_moments(chains, reference_samples)
+
+    def test_sample_chains_matches_sample(self, reference_samples):
+        """Parallel chains target the same distribution and are seeded."""
+        pytest.importorskip("joblib")
+        mh = MetropolisHastings(gaussian_log_density, proposal_std=1.0)
+        chains = mh.sample_chains(4, 5000, np.zeros(2), burn_in=1000,
+                                  seed=3, n_jobs=2)
+
+        assert chains.shape == (4, 5000, 2)
+        assert_matches_moments(chains, reference_samples)
+
+        # Child seeds are spawned from the root seed, so reruns agree and
+        # the chains differ from each other
+        again = mh.sample_chains(4, 5000, np.zeros(2), burn_in=1000,
+                                 seed=3, n_jobs=2)
+        np.testing.assert_array_equal(chains, again)
+        assert not np.array_equal(chains[0], chains[1])
+
 
 # ============================================================================
 # Hamiltonian Monte Carlo Tests
@@ -158,6 +281,83 @@ class TestHamiltonianMC:
         # Placeholder for multivariate test
         pass
 
+    @pytest.fixture(scope="class")
+    def reference_samples(self):
+        """
+        Draws from the plain NumPy sampler.
+
+        The trajectory length epsilon * L = 1.4 is kept well away from pi,
+        where the leapfrog orbit of a unit Gaussian nearly retraces itself
+        and the chain mixes poorly.
+        """
+        hmc = HamiltonianMC(gaussian_log_density, gaussian_grad_log_density,
+                            epsilon=0.2, L=7)
+        return hmc.sample(5000, np.zeros(2), burn_in=500, seed=0)
+
+    def test_sample_numba_matches_sample(self, reference_samples):
+        """The Numba-compiled loop targets the same distribution."""
+        pytest.importorskip("numba")
+        hmc = HamiltonianMC(gaussian_log_density, gaussian_grad_log_density,
+                            epsilon=0.2, L=7)
+        samples = hmc.sample_numba(5000, np.zeros(2), burn_in=500, seed=1)
+
+        assert samples.shape == (5000, 2)
+        assert_matches_moments(samples, reference_samples)
+
+    def test_jax_matches_sample(self, reference_samples):
+        """The lax.scan backend targets the same distribution."""
+        pytest.importorskip("jax")
+        hmc = HamiltonianMC(gaussian_log_density, epsilon=0.2, L=7,
+                            use_jax=True)
+        samples = hmc.sample(5000, np.zeros(2), burn_in=500, seed=2)
+
+        assert samples.shape == (5000, 2)
+        assert_matches_moments(samples, reference_samples)
+
+
+# ============================================================================
+# Affine-Invariant Ensemble Tests
+# ============================================================================
+
+class TestAffineInvariantEnsemble:
+    """Test suite for the stretch-move ensemble sampler."""
+
+    COV = np.array([[2.0, 1.2], [1.2, 1.0]])
+
+    def log_density(self, X):
+        """Correlated Gaussian N(MU, COV), one value per row of X."""
+        d = X - MU
+        return -0.5 * np.einsum('ij,jk,ik->i', d, np.linalg.inv(self.COV), d)
+
+    def test_recovers_covariance(self):
+        """Pooled walker draws recover a known mean and covariance."""
+        sampler = AffineInvariantEnsemble(self.log_density, n_walkers=16)
+        chains = sampler.sample(4000, np.zeros(2), burn_in=1000, seed=0)
+
+        assert chains.shape == (16, 4000, 2)
+        assert sampler.samples.shape == (16 * 4000, 2)
+        assert 0.2 < sampler.acceptance_rate < 0.9
+        np.testing.assert_allclose(sampler.samples.mean(axis=0), MU, atol=0.1)
+        np.testing.assert_allclose(np.cov(sampler.samples.T), self.COV,
+                                   atol=0.15)
+
+    def test_vectorize_flag_gives_same_chain(self):
+        """Per-walker and batched log-density calls give identical draws."""
+        kwargs = dict(n_samples=200, initial_state=np.zeros(2), burn_in=50,
+                      seed=1)
+        batched = AffineInvariantEnsemble(self.log_density, n_walkers=8)
+        looped = AffineInvariantEnsemble(
+            lambda x: self.log_density(x[None])[0], n_walkers=8,
+            vectorize=False)
+
+        np.testing.assert_allclose(batched.sample(**kwargs),
+                                   looped.sample(**kwargs))
+
+    def test_rejects_odd_ensemble(self):
+        """The two-half update needs an even number of walkers."""
+        with pytest.raises(ValueError):
+            AffineInvariantEnsemble(self.log_density, n_walkers=7)
+
 
 # ============================================================================
 # NUTS Sampler Tests
@@ -176,6 +376,50 @@ class TestNUTS:
         # Placeholder for tree building test
         pass
 
+    @pytest.fixture(scope="class")
+    def reference_samples(self):
+        """Draws from the single-chain NumPy sampler."""
+        nuts = NUTS(gaussian_log_density, gaussian_grad_log_density)
+        return nuts.sample(4000, np.zeros(2), burn_in=500, adapt_steps=500,
+                           seed=0)
+
+    def test_sample_chains_matches_sample(self, reference_samples):
+        """Batched chains agree with the single-chain sampler."""
+        nuts = NUTS(gaussian_log_density, gaussian_grad_log_density)
+        chains = nuts.sample_chains(1000, np.zeros((4, 2)), burn_in=500,
+                                    adapt_steps=500, seed=1)
+
+        assert chains.shape == (4, 1000, 2)
+        assert nuts.epsilon.shape == (4,)
+        assert np.all(np.isfinite(nuts.epsilon))
+        assert_matches_moments(chains, reference_samples)
+
+    def test_compiled_matches_sample(self, reference_samples):
+        """The Numba-compiled tree builder agrees with the NumPy one."""
+        pytest.importorskip("numba")
+        nuts = NUTS(gaussian_log_density, gaussian_grad_log_density)
+        nuts.compile()
+        samples = nuts.sample(4000, np.zeros(2), burn_in=500, adapt_steps=500,
+                              seed=2)
+
+        assert_matches_moments(samples, reference_samples)
+
+    def test_jax_matches_numpy(self, reference_samples):
+        """The vmapped JAX backend agrees with the NumPy sampler."""
+        pytest.importorskip("jax")
+        nuts = NUTS(gaussian_log_density, use_jax=True)
+        chains = nuts.sample_chains(1000, np.zeros((4, 2)), burn_in=500,
+                                    adapt_steps=500, seed=3)
+
+        assert chains.shape == (4, 1000, 2)
+        assert np.all(np.isfinite(nuts.epsilon))
+        assert_matches_moments(chains, reference_samples)
+
+        # Keys come from default_rng(seed), so a rerun reproduces the draws
+        again = nuts.sample_chains(1000, np.zeros((4, 2)), burn_in=500,
+                                   adapt_steps=500, seed=3)
+        np.testing.assert_array_equal(chains, again)
+
 
 # ============================================================================
 # Integration Tests
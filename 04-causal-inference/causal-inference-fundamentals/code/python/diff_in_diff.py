@@ -13,8 +13,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, lstsq
 from sklearn.linear_model import LinearRegression
-from typing import Tuple, Optional, List
+from typing import Callable, Tuple, Optional, List
 from dataclasses import dataclass
 
 sns.set_style("whitegrid")
@@ -32,6 +33,41 @@ class DiDResults:
     parallel_trends_pvalue: Optional[float] = None
 
 
+def _solve_normal_equations(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, Callable]:
+    """
+    Least squares via a Cholesky factorization of the normal equations.
+
+    For the few-column designs used here this is much cheaper than the SVD
+    behind ``np.linalg.lstsq``. Falls back to LAPACK ``gelsy`` (pivoted QR)
+    when ``X.T @ X`` is not positive definite (rank-deficient design).
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Design matrix (n, p)
+    y : np.ndarray
+        Response (n,)
+
+    Returns
+    -------
+    beta : np.ndarray
+        Coefficient estimates (p,)
+    gram_solve : callable
+        ``gram_solve(B)`` solves ``(X.T @ X) Z = B`` with the same factor, so
+        variances can be read off a few solves without forming the inverse
+    """
+    XtX = X.T @ X
+    Xty = X.T @ y
+    try:
+        c = cho_factor(XtX, lower=True, check_finite=False)
+    except LinAlgError:
+        XtX_pinv = np.linalg.pinv(XtX)
+        beta = lstsq(X, y, lapack_driver='gelsy', check_finite=False)[0]
+        return beta, lambda B: XtX_pinv @ B
+    beta = cho_solve(c, Xty, check_finite=False)
+    return beta, lambda B: cho_solve(c, B, check_finite=False)
+
+
 class DifferenceInDifferences:
     """
     Difference-in-Differences estimator.
@@ -39,7 +75,10 @@ class DifferenceInDifferences:
     Parameters
     ----------
     data : pd.DataFrame
-        Panel data with columns: unit_id, time_period, outcome, treated
+        Panel data with columns: unit_id, time_period, outcome, treated.
+        Numeric columns are read as contiguous float64 arrays without a copy
+        where pandas allows it, e.g. numpy-backed float columns or a frame
+        from ``pd.read_parquet(..., engine='pyarrow')`` with float columns.
     outcome_col : str
         Name of outcome variable
     treated_col : str
@@ -53,16 +92,30 @@ class DifferenceInDifferences:
     def __init__(self, data: pd.DataFrame, outcome_col: str = 'outcome',
                  treated_col: str = 'treated', time_col: str = 'post',
                  unit_col: str = 'unit_id'):
-        self.data = data.copy()
+        self.data = data
         self.outcome_col = outcome_col
         self.treated_col = treated_col
         self.time_col = time_col
         self.unit_col = unit_col
 
+        # Column arrays for the estimators, so the panel is never copied
+        # or mutated; unit ids become int64 codes so clusters sort fast
+        # whatever their original type
+        def _to_np(col):
+            return np.ascontiguousarray(data[col].to_numpy(dtype=np.float64, copy=False))
+
+        self._y = _to_np(outcome_col)
+        self._t = _to_np(time_col)
+        self._d = _to_np(treated_col)
+        self._u = pd.factorize(data[unit_col])[0].astype(np.int64, copy=False)
+
     def estimate_2x2(self, cluster_se: bool = True) -> DiDResults:
         """
         Estimate 2x2 DiD (two time periods, two groups).
 
+        Both the treated and the time column must be coded 0/1; anything
+        else raises a ``ValueError``.
+
         Parameters
         ----------
         cluster_se : bool
@@ -73,63 +126,73 @@ class DifferenceInDifferences:
         DiDResults
             Estimation results
         """
-        df = self.data
-
-        # Calculate group-time means
-        means = df.groupby([self.treated_col, self.time_col])[self.outcome_col].mean()
+        for name, col in ((self.treated_col, self._d), (self.time_col, self._t)):
+            if not np.all((col == 0) | (col == 1)):
+                raise ValueError(
+                    f"estimate_2x2 needs a binary 0/1 '{name}' column, "
+                    f"got values {np.unique(col)[:5].tolist()}")
+
+        # Calculate group-time means in one pass; cell 2 * treated + post
+        # holds Y_{treated, post}
+        cell = 2 * self._d.astype(np.int64) + self._t.astype(np.int64)
+        sums = np.bincount(cell, weights=self._y, minlength=4)
+        counts = np.bincount(cell, minlength=4)
+        Y_00, Y_01, Y_10, Y_11 = sums / counts  # Control pre/post, treated pre/post
 
         # DiD estimator
-        Y_11 = means.loc[(1, 1)]  # Treated, post
-        Y_10 = means.loc[(1, 0)]  # Treated, pre
-        Y_01 = means.loc[(0, 1)]  # Control, post
-        Y_00 = means.loc[(0, 0)]  # Control, pre
 
         att = (Y_11 - Y_10) - (Y_01 - Y_00)
 
         # Regression approach for standard errors
-        df['treat_post'] = df[self.treated_col] * df[self.time_col]
-
         # OLS: Y = β0 + β1*Treat + β2*Post + β3*Treat*Post + ε
-        X = df[[self.treated_col, self.time_col, 'treat_post']].values
-        X_with_const = np.column_stack([np.ones(len(df)), X])
-        y = df[self.outcome_col].values
+        X_with_const = np.column_stack([
+            np.ones(len(self._y)),
+            self._d,
+            self._t,
+            self._d * self._t
+        ])
+        y = self._y
 
-        beta = np.linalg.lstsq(X_with_const, y, rcond=None)[0]
+        beta, bread_solve = _solve_normal_equations(X_with_const, y)
         att_reg = beta[3]  # Interaction coefficient
 
-        # Standard errors
+        # Standard errors: only element (3, 3) of bread^-1 meat bread^-1 is
+        # needed, which is u' meat u with u = bread^-1 e_3
         residuals = y - X_with_const @ beta
+        u = bread_solve(np.eye(X_with_const.shape[1])[3])
 
         if cluster_se:
             # Cluster-robust standard errors at unit level
-            clusters = df[self.unit_col].values
-            unique_clusters = np.unique(clusters)
-            n_clusters = len(unique_clusters)
+            clusters = self._u
+
+            # Per-cluster score sums s_c = sum_{i in c} X_i r_i as one
+            # segmented reduction over the rows sorted by cluster
+            order = np.argsort(clusters, kind='stable')
+            scores = X_with_const[order] * residuals[order, None]
+            sorted_clusters = clusters[order]
+            starts = np.flatnonzero(np.r_[True, sorted_clusters[1:] != sorted_clusters[:-1]])
+            S = np.add.reduceat(scores, starts, axis=0)
+            n_clusters = len(starts)
 
             # Calculate clustered variance
-            meat = np.zeros((X_with_const.shape[1], X_with_const.shape[1]))
-            for cluster in unique_clusters:
-                idx = clusters == cluster
-                X_cluster = X_with_const[idx]
-                resid_cluster = residuals[idx]
-                meat += np.outer(X_cluster.T @ resid_cluster, X_cluster.T @ resid_cluster)
-
-            bread_inv = np.linalg.inv(X_with_const.T @ X_with_const / len(df))
-            var_beta = bread_inv @ meat @ bread_inv * n_clusters / (n_clusters - 1)
+            meat = S.T @ S
+
+            var_att = u @ meat @ u * n_clusters / (n_clusters - 1)
         else:
             # Heteroskedasticity-robust standard errors
-            meat = X_with_const.T @ (residuals[:, np.newaxis]**2 * X_with_const)
-            bread_inv = np.linalg.inv(X_with_const.T @ X_with_const)
-            var_beta = bread_inv @ meat @ bread_inv
+            # X' diag(r^2) X as a symmetric A' A product, A = X * |r|
+            A = X_with_const * np.abs(residuals)[:, None]
+            meat = A.T @ A
+            var_att = u @ meat @ u
 
-        se = np.sqrt(var_beta[3, 3])
+        se = np.sqrt(var_att)
 
         # Confidence interval
         ci_lower = att - 1.96 * se
         ci_upper = att + 1.96 * se
 
-        n_treat = df[df[self.treated_col] == 1][self.unit_col].nunique()
-        n_control = df[df[self.treated_col] == 0][self.unit_col].nunique()
+        n_treat = len(np.unique(self._u[self._d == 1]))
+        n_control = len(np.unique(self._u[self._d == 0]))
 
         return DiDResults(
             att=att,
@@ -156,17 +219,17 @@ class DifferenceInDifferences:
         """
         df_pre = self.data[self.data[self.time_col].isin(pre_periods)]
 
-        # Regress outcome on time trends separately for treated and control
-        results_treat = []
-        results_control = []
-
-        for period in pre_periods:
-            treat_mean = df_pre[(df_pre[self.time_col] == period) &
-                               (df_pre[self.treated_col] == 1)][self.outcome_col].mean()
-            control_mean = df_pre[(df_pre[self.time_col] == period) &
-                                 (df_pre[self.treated_col] == 0)][self.outcome_col].mean()
-            results_treat.append(treat_mean)
-            results_control.append(control_mean)
+        # Group-period means for treated and control in one pass. Groups
+        # are the ==1 / ==0 masks rather than the raw labels, so 0/1, bool
+        # and float codes all work; rows in neither group are dropped
+        is_treat = df_pre[self.treated_col] == 1
+        in_group = is_treat | (df_pre[self.treated_col] == 0)
+        df_pre = df_pre[in_group]
+        means = (df_pre.groupby([df_pre[self.time_col], is_treat[in_group]])
+                 [self.outcome_col].mean().unstack()
+                 .reindex(index=pre_periods, columns=[False, True]))
+        results_control = means[False].values
+        results_treat = means[True].values
 
         # Test if trends are parallel (interaction of time with treatment)
         n_periods = len(pre_periods)
@@ -179,13 +242,13 @@ class DifferenceInDifferences:
 
         y = np.concatenate([results_control, results_treat])
 
-        beta = np.linalg.lstsq(X, y, rcond=None)[0]
+        beta, gram_solve = _solve_normal_equations(X, y)
         residuals = y - X @ beta
 
         # F-test for interaction coefficient
         sigma2 = np.sum(residuals**2) / (len(y) - X.shape[1])
-        var_beta = sigma2 * np.linalg.inv(X.T @ X)
-        t_stat = beta[3] / np.sqrt(var_beta[3, 3])
+        var_interaction = sigma2 * gram_solve(np.eye(X.shape[1])[3])[3]
+        t_stat = beta[3] / np.sqrt(var_interaction)
         p_value = 2 * (1 - stats.t.cdf(abs(t_stat), len(y) - X.shape[1]))
 
         return p_value
@@ -206,44 +269,42 @@ class DifferenceInDifferences:
         pd.DataFrame
             Event study coefficients
         """
-        df = self.data.copy()
+        periods = [t for t in time_periods if t != base_period]
+        k = len(periods)
+
+        # One regression with period dummies and treated x period
+        # interactions for every non-base period at once
+        treated = self._d
+        P = (self._t[:, None] == np.asarray(periods)[None, :]).astype(float)
+        X_with_const = np.column_stack([
+            np.ones(len(self._y)),
+            treated,
+            P,
+            treated[:, None] * P
+        ])
+        y = self._y
 
-        # Create period indicators
-        estimates = []
+        beta, gram_solve = _solve_normal_equations(X_with_const, y)
+
+        # Standard errors (simplified)
+        residuals = y - X_with_const @ beta
+        sigma2 = np.sum(residuals**2) / (len(y) - X_with_const.shape[1])
+        interaction = slice(2 + k, 2 + 2 * k)
+        coefs = dict(zip(periods, beta[interaction]))
+        # Diagonal of (X'X)^-1 for the interaction columns only
+        Z = gram_solve(np.eye(X_with_const.shape[1])[:, interaction])
+        ses = dict(zip(periods, np.sqrt(sigma2 * np.diag(Z[interaction]))))
 
+        estimates = []
         for t in time_periods:
             if t == base_period:
                 # Normalized period
                 estimates.append({'period': t, 'coef': 0, 'se': 0, 'ci_lower': 0, 'ci_upper': 0})
                 continue
 
-            # Interaction between treatment and period indicator
-            df[f'period_{t}'] = (df[self.time_col] == t).astype(int)
-            df[f'treat_period_{t}'] = df[self.treated_col] * df[f'period_{t}']
-
-            # Run regression
-            period_cols = [c for c in df.columns if c.startswith('period_') or c.startswith('treat_period_')]
-            X = df[[self.treated_col] + period_cols].values
-            X_with_const = np.column_stack([np.ones(len(df)), X])
-            y = df[self.outcome_col].values
-
-            beta = np.linalg.lstsq(X_with_const, y, rcond=None)[0]
-
-            # Find coefficient for this period's interaction
-            col_idx = period_cols.index(f'treat_period_{t}') + 1 + 1  # +1 for const, +1 for treated main effect
-            coef = beta[col_idx]
-
-            # Standard error (simplified)
-            residuals = y - X_with_const @ beta
-            sigma2 = np.sum(residuals**2) / (len(y) - X_with_const.shape[1])
-            var_beta = sigma2 * np.linalg.inv(X_with_const.T @ X_with_const)
-            se = np.sqrt(var_beta[col_idx, col_idx])
-
-            ci_lower = coef - 1.96 * se
-            ci_upper = coef + 1.96 * se
-
+            coef, se = coefs[t], ses[t]
             estimates.append({'period': t, 'coef': coef, 'se': se,
-                            'ci_lower': ci_lower, 'ci_upper': ci_upper})
+                            'ci_lower': coef - 1.96 * se, 'ci_upper': coef + 1.96 * se})
 
         return pd.DataFrame(estimates)
 
@@ -347,27 +408,25 @@ def simulate_did_data(n_units: int = 500, n_periods: int = 2,
     # Treatment assignment (some units treated)
     treated = np.random.binomial(1, 0.5, n_units)
 
-    # Create panel
-    data = []
-    for t in range(n_periods):
-        post = int(t >= n_periods // 2)
-
-        for i in range(n_units):
-            # Outcome with unit FE, time trend, and treatment effect
-            y = (unit_fe[i] +
-                 3 * t +  # Common time trend
-                 treatment_effect * treated[i] * post +  # Treatment effect
-                 np.random.normal(0, 1))
+    # Create panel as (n_periods, n_units) grids, period-major like a
+    # stacked sequence of cross-sections
+    T, U = np.meshgrid(np.arange(n_periods), np.arange(n_units), indexing='ij')
+    post = (T >= n_periods // 2).astype(int)
+    D = np.broadcast_to(treated, T.shape)
 
-            data.append({
-                'unit_id': i,
-                'time': t,
-                'post': post,
-                'treated': treated[i],
-                'outcome': y
-            })
+    # Outcome with unit FE, time trend, and treatment effect
+    y = (unit_fe[U] +
+         3 * T +  # Common time trend
+         treatment_effect * D * post +  # Treatment effect
+         np.random.normal(0, 1, T.shape))
 
-    return pd.DataFrame(data)
+    return pd.DataFrame({
+        'unit_id': U.ravel(),
+        'time': T.ravel(),
+        'post': post.ravel(),
+        'treated': D.ravel(),
+        'outcome': y.ravel()
+    })
 
 
 def example_minimum_wage():
@@ -386,26 +445,25 @@ def example_minimum_wage():
     treated = (state == 'NJ').astype(int)
 
     # Create panel data (before and after minimum wage increase)
-    data = []
-    for period, post in [(0, 0), (1, 1)]:
-        for i in range(n):
-            # Employment (FTE employees)
-            baseline = 20 + np.random.normal(0, 5)
-            time_effect = 2 * post
-            treatment_effect = 3.0 * treated[i] * post  # Positive effect (contrary to theory!)
-
-            employment = baseline + time_effect + treatment_effect + np.random.normal(0, 2)
-
-            data.append({
-                'unit_id': i,
-                'state': state[i],
-                'time': period,
-                'post': post,
-                'treated': treated[i],
-                'outcome': employment
-            })
-
-    df = pd.DataFrame(data)
+    T, U = np.meshgrid([0, 1], np.arange(n), indexing='ij')
+    post = T
+    D = treated[U]
+
+    # Employment (FTE employees)
+    baseline = 20 + np.random.normal(0, 5, T.shape)
+    time_effect = 2 * post
+    treatment_effect = 3.0 * D * post  # Positive effect (contrary to theory!)
+
+    employment = baseline + time_effect + treatment_effect + np.random.normal(0, 2, T.shape)
+
+    df = pd.DataFrame({
+        'unit_id': U.ravel(),
+        'state': state[U].ravel(),
+        'time': T.ravel(),
+        'post': post.ravel(),
+        'treated': D.ravel(),
+        'outcome': employment.ravel()
+    })
 
     # Estimate DiD
     did = DifferenceInDifferences(df)
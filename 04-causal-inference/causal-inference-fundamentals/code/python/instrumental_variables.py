@@ -13,11 +13,102 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
-from typing import Tuple, Optional
+from scipy.linalg import lstsq, qr, solve_triangular
+from typing import Callable, Tuple, Optional
 from dataclasses import dataclass
 
 sns.set_style("whitegrid")
 
+_2SLS_CORE = None
+
+# LLVM fast-math flags without nnan/ninf, so a degenerate fit still
+# surfaces as NaN/inf rather than a silently wrong number
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+
+def _get_2sls_core() -> Callable:
+    """
+    Build (once) the Numba-compiled 2SLS kernel.
+
+    Numba is imported lazily so the module stays usable without it. Both
+    stages use ``np.linalg.qr``; the triangular inverse of the second-stage
+    R factor is a hand-written back-substitution, since SciPy's triangular
+    solvers are not available in compiled code.
+
+    Returns
+    -------
+    callable
+        ``_2sls_core(Y, D, Z_full, n_exog, robust) ->
+        (beta, se, r2_first, sargan_stat)``
+    """
+    global _2SLS_CORE
+    if _2SLS_CORE is None:
+        from numba import njit
+
+        @njit(cache=True, fastmath=_FASTMATH)
+        def _2sls_core(Y, D, Z_full, n_exog, robust):
+            n, m = D.shape
+
+            # First stage: D_hat = Q_z Q_z' D. LAPACK returns Q column-major;
+            # asfortranarray only fixes the layout type, so Q_z and its
+            # transpose view are both contiguous without copying the n x k
+            # factor
+            Q_z, _ = np.linalg.qr(Z_full)
+            Q_z = np.asfortranarray(Q_z)
+            Q_zT = Q_z.T
+            D_hat = Q_z @ (Q_zT @ D)
+            ss_res_first = np.sum((D - D_hat) ** 2)
+            ss_tot_first = np.sum((D - D.mean()) ** 2)
+            r2_first = 1.0 - ss_res_first / ss_tot_first
+
+            # Second stage on [exogenous columns of Z_full, D_hat]
+            k = n_exog + m
+            W = np.empty((n, k))
+            W[:, :n_exog] = Z_full[:, :n_exog]
+            W[:, n_exog:] = D_hat
+            Q_2, R_2 = np.linalg.qr(W)
+            Q_2T = np.asfortranarray(Q_2).T
+
+            # R_2^{-1} by back-substitution, column by column
+            R_inv = np.zeros((k, k))
+            for c in range(k):
+                for i in range(c, -1, -1):
+                    acc = 1.0 if i == c else 0.0
+                    for j in range(i + 1, c + 1):
+                        acc -= R_2[i, j] * R_inv[j, c]
+                    R_inv[i, c] = acc / R_2[i, i]
+
+            beta = R_inv @ (Q_2T @ Y)
+            residuals = Y - W @ beta
+            bread_inv = R_inv @ np.ascontiguousarray(R_inv.T)
+
+            if robust:
+                meat = np.zeros((k, k))
+                for i in range(n):
+                    r2 = residuals[i] * residuals[i]
+                    for a in range(k):
+                        wa = r2 * W[i, a]
+                        for b in range(a, k):
+                            meat[a, b] += wa * W[i, b]
+                for a in range(k):
+                    for b in range(a):
+                        meat[a, b] = meat[b, a]
+                var_beta = bread_inv @ meat @ bread_inv
+            else:
+                sigma2 = np.sum(residuals ** 2) / (n - k)
+                var_beta = sigma2 * bread_inv
+
+            se = np.sqrt(np.diag(var_beta))
+
+            # Sargan statistic r' P_Z r / (r' r / n), P_Z = Q_z Q_z'
+            Qr = Q_zT @ residuals
+            sargan_stat = (Qr @ Qr) / ((residuals @ residuals) / n)
+
+            return beta, se, r2_first, sargan_stat
+
+        _2SLS_CORE = _2sls_core
+    return _2SLS_CORE
+
 
 @dataclass
 class IVResults:
@@ -55,6 +146,27 @@ class InstrumentalVariables:
 
         self.n = len(Y)
         self.results = None
+        self._Q_z = None
+        self._Q_z_key = None
+
+    def _stacked_design(self, last: np.ndarray) -> np.ndarray:
+        """
+        Design [1, X, last], filled into one preallocated array.
+
+        Controls (if any) enter both stages, so the first stage uses
+        ``last = Z`` and the second ``last = D_hat``.
+        """
+        k_controls = 0 if self.X is None else self.X.shape[1]
+        design = np.empty((self.n, 1 + k_controls + last.shape[1]))
+        design[:, 0] = 1.0
+        if self.X is not None:
+            design[:, 1:1 + k_controls] = self.X.reshape(self.n, -1)
+        design[:, 1 + k_controls:] = last
+        return design
+
+    def _instrument_matrix(self) -> np.ndarray:
+        """First-stage design [1, X, Z]."""
+        return self._stacked_design(self.Z)
 
     def fit(self, robust_se: bool = True) -> IVResults:
         """
@@ -70,17 +182,20 @@ class InstrumentalVariables:
         IVResults
             Estimation results
         """
-        # Prepare design matrices
-        if self.X is not None:
-            # Include controls in both stages
-            Z_full = np.hstack([np.ones((self.n, 1)), self.X, self.Z])
-            X_with_const = np.hstack([np.ones((self.n, 1)), self.X])
-        else:
-            Z_full = np.hstack([np.ones((self.n, 1)), self.Z])
-            X_with_const = np.ones((self.n, 1))
-
-        # First stage: regress D on Z (and X if present)
-        D_hat = Z_full @ np.linalg.lstsq(Z_full, self.D, rcond=None)[0]
+        # First stage: regress D on Z (and X if present). With the economic
+        # QR Z_full = Q_z R_z the fitted values are the projection Q_z Q_z' D.
+        # Q_z is factored once and kept for later fits and the Sargan test,
+        # keyed on the Z and X arrays (held by reference, so reassigning
+        # either attribute refactors) and their shapes
+        shapes = (self.Z.shape, None if self.X is None else self.X.shape)
+        cached = self._Q_z_key
+        if (cached is None or cached[0] is not self.Z
+                or cached[1] is not self.X or cached[2] != shapes):
+            self._Q_z = qr(self._instrument_matrix(), mode='economic',
+                           check_finite=False)[0]
+            self._Q_z_key = (self.Z, self.X, shapes)
+        Q_z = self._Q_z
+        D_hat = Q_z @ (Q_z.T @ self.D)
 
         # First stage diagnostics
         residuals_first = self.D - D_hat
@@ -96,37 +211,38 @@ class InstrumentalVariables:
         f_stat = (r2_first / k_instruments) / ((1 - r2_first) / (self.n - k_total))
 
         # Second stage: regress Y on D_hat (and X if present)
-        if self.X is not None:
-            D_hat_full = np.hstack([np.ones((self.n, 1)), self.X, D_hat])
-        else:
-            D_hat_full = np.hstack([np.ones((self.n, 1)), D_hat])
+        D_hat_full = self._stacked_design(D_hat)
 
-        beta_iv = np.linalg.lstsq(D_hat_full, self.Y, rcond=None)[0]
+        Q_2, R_2 = qr(D_hat_full, mode='economic', check_finite=False)
+        beta_iv = solve_triangular(R_2, Q_2.T @ self.Y, check_finite=False)
 
         # Calculate standard errors
         residuals = self.Y - D_hat_full @ beta_iv
 
-        if robust_se:
-            # Heteroskedasticity-robust standard errors
-            meat = np.zeros((D_hat_full.shape[1], D_hat_full.shape[1]))
-            for i in range(self.n):
-                meat += residuals[i]**2 * np.outer(D_hat_full[i], D_hat_full[i])
+        # (D_hat_full' D_hat_full)^{-1} = R_2^{-1} R_2^{-T} by triangular solves
+        R_2_inv = solve_triangular(R_2, np.eye(R_2.shape[0]), check_finite=False)
+        bread_inv = R_2_inv @ R_2_inv.T
 
-            bread_inv = np.linalg.inv(D_hat_full.T @ D_hat_full / self.n)
-            var_beta = bread_inv @ meat @ bread_inv / self.n
+        if robust_se:
+            # Heteroskedasticity-robust (HC0) standard errors; the meat
+            # sum_i r_i^2 x_i x_i' is A' A with A = D_hat_full * |r|
+            A = D_hat_full * np.abs(residuals)
+            meat = A.T @ A
+            var_beta = bread_inv @ meat @ bread_inv
         else:
             # Homoskedastic standard errors
             sigma2 = np.sum(residuals**2) / (self.n - D_hat_full.shape[1])
-            var_beta = sigma2 * np.linalg.inv(D_hat_full.T @ D_hat_full)
+            var_beta = sigma2 * bread_inv
 
         se_iv = np.sqrt(np.diag(var_beta))
 
         # Sargan test for overidentification (if we have more instruments than endogenous vars)
         if k_instruments > self.D.shape[1]:
-            # Regress 2SLS residuals on all instruments
+            # Regress 2SLS residuals on all instruments, reusing the
+            # first-stage factor: r' Q_z Q_z' r = ||Q_z' r||^2
             sargan_resid = residuals
-            proj = Z_full @ np.linalg.lstsq(Z_full, sargan_resid, rcond=None)[0]
-            sargan_stat = (sargan_resid.T @ proj).item() / (residuals.T @ residuals / self.n).item()
+            Qr = Q_z.T @ sargan_resid
+            sargan_stat = (Qr.T @ Qr).item() / ((residuals.T @ residuals).item() / self.n)
             df = k_instruments - self.D.shape[1]
             sargan_pvalue = 1 - stats.chi2.cdf(sargan_stat, df)
         else:
@@ -144,6 +260,55 @@ class InstrumentalVariables:
 
         return self.results
 
+    def fit_numba(self, robust_se: bool = True) -> IVResults:
+        """
+        Estimate IV model using 2SLS with a Numba-compiled core.
+
+        Same estimator as :meth:`fit`; the two QR stages, residuals and the
+        robust meat run in compiled code, which removes the per-call NumPy
+        dispatch that dominates repeated fits of small models (simulations,
+        bootstraps). For large N the QR factorizations dominate and
+        :meth:`fit` is as fast or faster.
+
+        Parameters
+        ----------
+        robust_se : bool
+            Use heteroskedasticity-robust standard errors
+
+        Returns
+        -------
+        IVResults
+            Estimation results
+        """
+        Z_full = np.ascontiguousarray(self._instrument_matrix(), dtype=np.float64)
+        n_exog = Z_full.shape[1] - self.Z.shape[1]
+
+        beta, se, r2_first, sargan_stat = _get_2sls_core()(
+            np.ascontiguousarray(self.Y[:, 0], dtype=np.float64),
+            np.ascontiguousarray(self.D, dtype=np.float64),
+            Z_full, n_exog, robust_se)
+
+        k_instruments = self.Z.shape[1]
+        f_stat = (r2_first / k_instruments) / ((1 - r2_first) / (self.n - Z_full.shape[1]))
+
+        if k_instruments > self.D.shape[1]:
+            df = k_instruments - self.D.shape[1]
+            sargan_pvalue = 1 - stats.chi2.cdf(sargan_stat, df)
+        else:
+            sargan_stat = None
+            sargan_pvalue = None
+
+        self.results = IVResults(
+            beta_iv=beta.reshape(-1, 1),
+            se_iv=se,
+            first_stage_f=f_stat,
+            first_stage_r2=r2_first,
+            sargan_stat=sargan_stat,
+            sargan_pvalue=sargan_pvalue
+        )
+
+        return self.results
+
     def summary(self) -> str:
         """Print estimation summary."""
         if self.results is None:
@@ -172,10 +337,14 @@ class InstrumentalVariables:
                    ([f'Control_{i+1}' for i in range(self.X.shape[1])] if self.X is not None else []) + \
                    ['Treatment']
 
-        for i, (name, coef, se) in enumerate(zip(var_names, self.results.beta_iv.flatten(),
-                                                   self.results.se_iv)):
-            t_stat = coef / se
-            p_value = 2 * (1 - stats.t.cdf(abs(t_stat), self.n - len(var_names)))
+        # t-statistics and two-sided p-values for all coefficients at once
+        # (sf rather than 1 - cdf keeps small p-values accurate)
+        coefs = self.results.beta_iv.flatten()
+        t_stats = coefs / self.results.se_iv
+        p_values = 2 * stats.t.sf(np.abs(t_stats), self.n - len(var_names))
+
+        for name, coef, se, t_stat, p_value in zip(var_names, coefs, self.results.se_iv,
+                                                   t_stats, p_values):
             output.append(f"{name:<20} {coef:>12.4f} {se:>12.4f} {t_stat:>10.3f} {p_value:>10.4f}")
 
         if self.results.sargan_stat is not None:
@@ -208,20 +377,20 @@ def simulate_iv_data(n: int = 1000, instrument_strength: float = 0.5,
     pd.DataFrame
         Simulated data
     """
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
 
     # Confounder (unobserved)
-    U = np.random.normal(0, 1, n)
+    U = rng.normal(0, 1, n)
 
     # Instrument (e.g., randomized encouragement)
-    Z = np.random.binomial(1, 0.5, n)
+    Z = rng.integers(0, 2, n)
 
     # Treatment (endogenous because of U)
-    D = instrument_strength * Z + confounding * U + np.random.normal(0, 0.5, n)
+    D = instrument_strength * Z + confounding * U + rng.normal(0, 0.5, n)
 
     # Outcome
     true_effect = 1.5
-    Y = true_effect * D + confounding * U + np.random.normal(0, 1, n)
+    Y = true_effect * D + confounding * U + rng.normal(0, 1, n)
 
     return pd.DataFrame({'Y': Y, 'D': D, 'Z': Z, 'U': U})
 
@@ -237,27 +406,25 @@ def example_returns_to_schooling():
 
     # Simulate data
     n = 5000
-    np.random.seed(123)
+    rng = np.random.default_rng(123)
 
     # Quarter of birth (instrument)
-    quarter = np.random.randint(1, 5, n)
+    quarter = rng.integers(1, 5, n)
     Z = (quarter == 1).astype(int)  # Born in Q1
 
     # Unobserved ability
-    ability = np.random.normal(0, 1, n)
+    ability = rng.normal(0, 1, n)
 
     # Years of education (endogenous)
-    education = 12 + 0.3 * Z - 0.4 * ability + np.random.normal(0, 2, n)
+    education = 12 + 0.3 * Z - 0.4 * ability + rng.normal(0, 2, n)
 
     # Log earnings
     true_return = 0.08  # 8% return per year of education
-    log_earnings = 2.0 + true_return * education + 0.3 * ability + np.random.normal(0, 0.5, n)
+    log_earnings = 2.0 + true_return * education + 0.3 * ability + rng.normal(0, 0.5, n)
 
     # OLS (biased due to ability confounding)
-    from sklearn.linear_model import LinearRegression
-    ols = LinearRegression()
-    ols.fit(education.reshape(-1, 1), log_earnings)
-    ols_coef = ols.coef_[0]
+    X_ols = np.column_stack([np.ones(n), education])
+    ols_coef = lstsq(X_ols, log_earnings, lapack_driver='gelsy', check_finite=False)[0][1]
 
     print(f"OLS estimate: {ols_coef:.4f}")
     print(f"True effect: {true_return:.4f}")
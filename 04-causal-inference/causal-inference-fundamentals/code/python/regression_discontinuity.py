@@ -13,13 +13,89 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import PolynomialFeatures
-from typing import Tuple, Optional
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, lstsq
+from typing import Callable, List, Tuple, Optional
 from dataclasses import dataclass
 
 sns.set_style("whitegrid")
 
+_RDD_WLS = None
+
+
+def _get_rdd_wls() -> Callable:
+    """
+    Build (once) the Numba-compiled local polynomial WLS kernel.
+
+    Numba is imported lazily so the module stays usable without it. The
+    kernel makes one pass over the window to accumulate ``X' W X`` and
+    ``X' W y`` for the design ``[1, D, x^k, D * x^k]`` without materializing
+    it, solves, then makes a second pass for the robust-variance meat.
+
+    Returns
+    -------
+    callable
+        ``_rdd_wls(x, y, bandwidth, order) -> (tau, se)``
+    """
+    global _RDD_WLS
+    if _RDD_WLS is None:
+        from numba import njit
+
+        @njit(cache=True)
+        def _rdd_wls(x, y, bandwidth, order):
+            n = x.shape[0]
+            k = 2 * order + 2
+            XtWX = np.zeros((k, k))
+            XtWy = np.zeros(k)
+            row = np.empty(k)
+
+            for i in range(n):
+                w = 1.0 - abs(x[i]) / bandwidth
+                d = 1.0 if x[i] >= 0 else 0.0
+                row[0] = 1.0
+                row[1] = d
+                xp = 1.0
+                for j in range(order):
+                    xp *= x[i]
+                    row[2 + j] = xp
+                    row[2 + order + j] = d * xp
+                for a in range(k):
+                    wa = w * row[a]
+                    XtWy[a] += wa * y[i]
+                    for b in range(a, k):
+                        XtWX[a, b] += wa * row[b]
+            for a in range(k):
+                for b in range(a):
+                    XtWX[a, b] = XtWX[b, a]
+
+            beta = np.linalg.solve(XtWX, XtWy)
+
+            meat = np.zeros((k, k))
+            for i in range(n):
+                w = 1.0 - abs(x[i]) / bandwidth
+                d = 1.0 if x[i] >= 0 else 0.0
+                row[0] = 1.0
+                row[1] = d
+                xp = 1.0
+                for j in range(order):
+                    xp *= x[i]
+                    row[2 + j] = xp
+                    row[2 + order + j] = d * xp
+                r = y[i] - row @ beta
+                s = w * r * r
+                for a in range(k):
+                    for b in range(k):
+                        meat[a, b] += s * row[a] * row[b]
+
+            # Only element (1, 1) of the sandwich is needed: with
+            # u = (X' W X)^{-1} e_1 it is u' meat u
+            e1 = np.zeros(k)
+            e1[1] = 1.0
+            u = np.linalg.solve(XtWX, e1)
+            return beta[1], np.sqrt(u @ meat @ u)
+
+        _RDD_WLS = _rdd_wls
+    return _RDD_WLS
+
 
 @dataclass
 class RDDResults:
@@ -33,6 +109,151 @@ class RDDResults:
     n_right: int
 
 
+def _vander(x: np.ndarray, degree: int, include_bias: bool = True) -> np.ndarray:
+    """
+    Polynomial features ``[1, x, x**2, ..., x**degree]`` of a 1-D array.
+
+    Same columns as ``PolynomialFeatures(degree).fit_transform(x[:, None])``
+    without the sklearn validation overhead. Each power is one in-place
+    multiply of the previous one into its own contiguous row, rather than a
+    general ``x**k``.
+    """
+    powers = np.empty((degree + 1, len(x)), dtype=x.dtype)
+    powers[0] = 1.0
+    for k in range(1, degree + 1):
+        np.multiply(powers[k - 1], x, out=powers[k])
+    V = powers.T
+    return V if include_bias else V[:, 1:]
+
+
+def _solve_normal_equations(X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, Callable]:
+    """
+    Least squares via a Cholesky factorization of the normal equations.
+
+    For the few-column designs used here this is much cheaper than the SVD
+    behind ``np.linalg.lstsq``. Falls back to LAPACK ``gelsy`` (pivoted QR)
+    when ``X.T @ X`` is not positive definite (rank-deficient design).
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Design matrix (n, p)
+    y : np.ndarray
+        Response (n,)
+
+    Returns
+    -------
+    beta : np.ndarray
+        Coefficient estimates (p,)
+    gram_solve : callable
+        ``gram_solve(B)`` solves ``(X.T @ X) Z = B`` with the same factor, so
+        variances can be read off a few solves without forming the inverse
+    """
+    XtX = X.T @ X
+    Xty = X.T @ y
+    try:
+        c = cho_factor(XtX, lower=True, check_finite=False)
+    except LinAlgError:
+        XtX_pinv = np.linalg.pinv(XtX)
+        beta = lstsq(X, y, lapack_driver='gelsy', check_finite=False)[0]
+        return beta, lambda B: XtX_pinv @ B
+    beta = cho_solve(c, Xty, check_finite=False)
+    return beta, lambda B: cho_solve(c, B, check_finite=False)
+
+
+def _solve_gram(XtX: np.ndarray, Xty: np.ndarray) -> Tuple[np.ndarray, Callable]:
+    """
+    Same as :func:`_solve_normal_equations` for an already accumulated
+    ``X.T @ X`` and ``X.T @ y``; the rank-deficient fallback is the
+    pseudo-inverse, which gives the same minimum-norm solution as ``gelsy``.
+    """
+    try:
+        c = cho_factor(XtX, lower=True, check_finite=False)
+    except LinAlgError:
+        XtX_pinv = np.linalg.pinv(XtX)
+        return XtX_pinv @ Xty, lambda B: XtX_pinv @ B
+    beta = cho_solve(c, Xty, check_finite=False)
+    return beta, lambda B: cho_solve(c, B, check_finite=False)
+
+
+def _rdd_design(x: np.ndarray, polynomial_order: int, n_left: int) -> np.ndarray:
+    """
+    Local polynomial RDD design ``[1, D, x^k, D * x^k]`` for sorted ``x``.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sorted, centred running variable; its dtype sets the design dtype
+    polynomial_order : int
+        Order of the polynomial in x
+    n_left : int
+        Number of rows below the cutoff, so rows ``n_left:`` are treated
+
+    Returns
+    -------
+    np.ndarray
+        Design matrix (n, 2 * polynomial_order + 2)
+    """
+    # Polynomial features [1, x, ..., x^p]; column 0 doubles as intercept
+    x_powers = _vander(x, polynomial_order)
+    x_poly = x_powers[:, 1:]
+
+    # Filled in place as one C-contiguous block so the Gram matrix is a
+    # single GEMM
+    p = polynomial_order
+    X = np.empty((len(x), 2 * p + 2), dtype=x.dtype)
+    X[:, 0] = x_powers[:, 0]  # Intercept
+    X[:n_left, 1] = 0.0  # Treatment indicator
+    X[n_left:, 1] = 1.0
+    X[:, 2:p + 2] = x_poly  # Polynomial of running variable
+    X[:n_left, p + 2:] = 0.0  # Interactions: D * x^k is a masked copy
+    X[n_left:, p + 2:] = x_poly[n_left:]
+    return X
+
+
+def _binned_means(x: np.ndarray, y: np.ndarray, n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Means of ``x`` and ``y`` within equal-width bins of ``x``.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Values that define the bins
+    y : np.ndarray
+        Values averaged alongside ``x``
+    n_bins : int
+        Number of bins spanning ``[x.min(), x.max()]``
+
+    Returns
+    -------
+    x_mean, y_mean : np.ndarray
+        Bin means, omitting empty bins
+    """
+    edges = np.linspace(x.min(), x.max(), n_bins + 1)
+    idx = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_bins - 1)
+    counts = np.bincount(idx, minlength=n_bins)
+    nonempty = counts > 0
+    x_sum = np.bincount(idx, weights=x, minlength=n_bins)
+    y_sum = np.bincount(idx, weights=y, minlength=n_bins)
+    return x_sum[nonempty] / counts[nonempty], y_sum[nonempty] / counts[nonempty]
+
+
+def _line_fit(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """
+    Closed-form simple linear regression of ``y`` on ``x``.
+
+    Returns
+    -------
+    intercept, slope : float
+        Same line as ``np.polyfit(x, y, 1)``, without the Vandermonde/SVD
+    """
+    mx = x.mean()
+    my = y.mean()
+    dx = x - mx
+    slope = (dx * (y - my)).sum() / (dx * dx).sum()
+    return my - slope * mx, slope
+
+
 class RegressionDiscontinuity:
     """
     Regression Discontinuity Design estimator.
@@ -60,6 +281,11 @@ class RegressionDiscontinuity:
         # Center running variable at cutoff
         self.x_centered = self.running_var - self.cutoff
 
+        # Sorted copies so a bandwidth window is a contiguous slice
+        self._order = np.argsort(self.x_centered, kind='stable')
+        self._xs = self.x_centered[self._order]
+        self._ys = self.outcome[self._order]
+
     def imbens_kalyanaraman_bandwidth(self) -> float:
         """
         Calculate optimal bandwidth using Imbens-Kalyanaraman method.
@@ -76,24 +302,23 @@ class RegressionDiscontinuity:
         mask_left = (self.x_centered < 0) & (abs(self.x_centered) < h_pilot)
         mask_right = (self.x_centered >= 0) & (abs(self.x_centered) < h_pilot)
 
-        # Fit cubic polynomials
-        poly = PolynomialFeatures(degree=3)
+        # Fit cubic polynomials by normal equations on [1, x, x^2, x^3]
+        y_left = self.outcome[mask_left]
+        y_right = self.outcome[mask_right]
 
         # Left side
         if mask_left.sum() > 10:
-            X_left = poly.fit_transform(self.x_centered[mask_left].reshape(-1, 1))
-            y_left = self.outcome[mask_left]
-            model_left = LinearRegression().fit(X_left, y_left)
-            m2_left = 2 * model_left.coef_[2]  # Second derivative
+            coef_left = _solve_normal_equations(
+                _vander(self.x_centered[mask_left], 3), y_left)[0]
+            m2_left = 2 * coef_left[2]  # Second derivative
         else:
             m2_left = 0
 
         # Right side
         if mask_right.sum() > 10:
-            X_right = poly.fit_transform(self.x_centered[mask_right].reshape(-1, 1))
-            y_right = self.outcome[mask_right]
-            model_right = LinearRegression().fit(X_right, y_right)
-            m2_right = 2 * model_right.coef_[2]
+            coef_right = _solve_normal_equations(
+                _vander(self.x_centered[mask_right], 3), y_right)[0]
+            m2_right = 2 * coef_right[2]
         else:
             m2_right = 0
 
@@ -114,7 +339,8 @@ class RegressionDiscontinuity:
 
         return h_ik
 
-    def local_linear_regression(self, bandwidth: float, polynomial_order: int = 1) -> RDDResults:
+    def local_linear_regression(self, bandwidth: float, polynomial_order: int = 1,
+                                dtype: np.dtype = np.float64) -> RDDResults:
         """
         Estimate treatment effect using local linear regression.
 
@@ -124,58 +350,59 @@ class RegressionDiscontinuity:
             Bandwidth for local regression
         polynomial_order : int
             Order of polynomial (1 for local linear, 2 for local quadratic)
+        dtype : np.dtype, optional
+            Working precision of the design and solve. ``np.float32`` halves
+            memory traffic for repeated refits; with the running variable
+            centred at the cutoff the low-order design stays well conditioned.
 
         Returns
         -------
         RDDResults
             Estimation results
         """
-        # Select observations within bandwidth
-        mask = abs(self.x_centered) <= bandwidth
-        x_local = self.x_centered[mask]
-        y_local = self.outcome[mask]
-
-        # Create treatment indicator
-        treated = (x_local >= 0).astype(float)
-
-        # Create polynomial features
-        poly = PolynomialFeatures(degree=polynomial_order, include_bias=False)
-        x_poly = poly.fit_transform(x_local.reshape(-1, 1))
-
-        # Interaction terms: treatment * polynomial features
-        X = np.column_stack([
-            np.ones(len(x_local)),  # Intercept
-            treated,  # Treatment indicator
-            x_poly,  # Polynomial of running variable
-            treated.reshape(-1, 1) * x_poly  # Interactions
-        ])
-
-        # Triangular kernel weights
-        weights = (1 - abs(x_local / bandwidth)) * mask[mask]
-
-        # Weighted least squares
-        W = np.diag(weights)
-        X_weighted = np.sqrt(W) @ X
-        y_weighted = np.sqrt(W) @ y_local
+        # Select observations within bandwidth (binary search on sorted x)
+        lo = np.searchsorted(self._xs, -bandwidth, side='left')
+        hi = np.searchsorted(self._xs, bandwidth, side='right')
+        x_local = self._xs[lo:hi].astype(dtype, copy=False)
+        y_local = self._ys[lo:hi].astype(dtype, copy=False)
+
+        # The window is sorted, so treated rows (x >= 0) are its tail
+        n_left = int(np.searchsorted(x_local, 0.0, side='left'))
+        n_right = len(x_local) - n_left
+
+        X = _rdd_design(x_local, polynomial_order, n_left)
+
+        # Triangular kernel weights 1 - |x| / h, built in one buffer
+        weights = np.empty_like(x_local)
+        np.abs(x_local, out=weights)
+        weights *= 1.0 / bandwidth
+        np.subtract(1.0, weights, out=weights)
+
+        # Weighted least squares: scaling each row by sqrt(w_i) is the same
+        # as weighting by diag(w), without forming the n x n matrix
+        sw = np.sqrt(weights)
+        X_weighted = X * sw[:, None]
+        y_weighted = y_local * sw
 
         # Estimate
-        beta = np.linalg.lstsq(X_weighted, y_weighted, rcond=None)[0]
-        treatment_effect = beta[1]
+        # (X_weighted.T @ X_weighted is the X' W X bread of the sandwich)
+        beta, bread_solve = _solve_normal_equations(X_weighted, y_weighted)
+        treatment_effect = float(beta[1])
 
         # Standard error (heteroskedasticity-robust)
+        # meat = X' diag(w r^2) X = A' A with A = X_weighted * |r|; the
+        # weighted design is no longer needed, so scale it in place
         residuals = y_local - X @ beta
-        meat = X.T @ (W * (residuals**2)[:, np.newaxis] * X)
-        bread_inv = np.linalg.inv(X.T @ W @ X)
-        var_beta = bread_inv @ meat @ bread_inv
-        se = np.sqrt(var_beta[1, 1])
+        X_weighted *= np.abs(residuals)[:, None]
+        meat = X_weighted.T @ X_weighted
+        # Element (1, 1) of bread^-1 meat bread^-1, with u = bread^-1 e_1
+        u = bread_solve(np.eye(len(beta), dtype=X.dtype)[1])
+        se = float(np.sqrt(u @ meat @ u))
 
         # Confidence interval
         ci_lower = treatment_effect - 1.96 * se
         ci_upper = treatment_effect + 1.96 * se
 
-        n_left = (x_local < 0).sum()
-        n_right = (x_local >= 0).sum()
-
         return RDDResults(
             treatment_effect=treatment_effect,
             standard_error=se,
@@ -186,6 +413,103 @@ class RegressionDiscontinuity:
             n_right=n_right
         )
 
+    def local_linear_regression_numba(self, bandwidth: float,
+                                      polynomial_order: int = 1) -> RDDResults:
+        """
+        Estimate treatment effect with the Numba-compiled WLS kernel.
+
+        Same estimator as :meth:`local_linear_regression`, but the design,
+        normal equations and sandwich variance are accumulated row by row in
+        compiled code, which avoids per-call NumPy temporaries in bandwidth
+        sweeps and bootstrap loops.
+
+        Parameters
+        ----------
+        bandwidth : float
+            Bandwidth for local regression
+        polynomial_order : int
+            Order of polynomial (1 for local linear, 2 for local quadratic)
+
+        Returns
+        -------
+        RDDResults
+            Estimation results
+        """
+        lo = np.searchsorted(self._xs, -bandwidth, side='left')
+        hi = np.searchsorted(self._xs, bandwidth, side='right')
+        x_local = np.ascontiguousarray(self._xs[lo:hi], dtype=np.float64)
+        y_local = np.ascontiguousarray(self._ys[lo:hi], dtype=np.float64)
+
+        tau, se = _get_rdd_wls()(x_local, y_local, float(bandwidth), polynomial_order)
+        n_left = int(np.searchsorted(x_local, 0.0, side='left'))
+
+        return RDDResults(
+            treatment_effect=float(tau),
+            standard_error=float(se),
+            ci_lower=float(tau - 1.96 * se),
+            ci_upper=float(tau + 1.96 * se),
+            bandwidth=bandwidth,
+            n_left=n_left,
+            n_right=len(x_local) - n_left
+        )
+
+    def bandwidth_sweep(self, bandwidths: np.ndarray,
+                        polynomial_order: int = 1) -> List[RDDResults]:
+        """
+        Estimate treatment effects for a sequence of bandwidths.
+
+        Equivalent to calling :meth:`local_linear_regression` for each
+        bandwidth, but the design of the whole sorted sample and the per-row
+        outer products ``x_i x_i'`` are built once. Each bandwidth then only
+        reweights the rows of its window, so the Gram matrix, ``X' W y`` and
+        the robust meat are weighted sums over precomputed rows.
+
+        Parameters
+        ----------
+        bandwidths : array-like
+            Bandwidths to estimate at
+        polynomial_order : int
+            Order of polynomial (1 for local linear, 2 for local quadratic)
+
+        Returns
+        -------
+        list of RDDResults
+            Estimation results, one per bandwidth
+        """
+        n_left_all = int(np.searchsorted(self._xs, 0.0, side='left'))
+        X = _rdd_design(self._xs, polynomial_order, n_left_all)
+        k = X.shape[1]
+        XX = (X[:, :, None] * X[:, None, :]).reshape(len(X), k * k)
+        Xy = X * self._ys[:, None]
+        abs_x = np.abs(self._xs)
+        e1 = np.eye(k)[1]
+
+        results = []
+        for bandwidth in bandwidths:
+            lo = np.searchsorted(self._xs, -bandwidth, side='left')
+            hi = np.searchsorted(self._xs, bandwidth, side='right')
+            weights = 1.0 - abs_x[lo:hi] * (1.0 / bandwidth)
+
+            beta, bread_solve = _solve_gram((weights @ XX[lo:hi]).reshape(k, k),
+                                            weights @ Xy[lo:hi])
+            residuals = self._ys[lo:hi] - X[lo:hi] @ beta
+            meat = ((weights * residuals**2) @ XX[lo:hi]).reshape(k, k)
+            u = bread_solve(e1)
+
+            treatment_effect = float(beta[1])
+            se = float(np.sqrt(u @ meat @ u))
+            results.append(RDDResults(
+                treatment_effect=treatment_effect,
+                standard_error=se,
+                ci_lower=treatment_effect - 1.96 * se,
+                ci_upper=treatment_effect + 1.96 * se,
+                bandwidth=bandwidth,
+                n_left=n_left_all - lo,
+                n_right=hi - n_left_all
+            ))
+
+        return results
+
     def estimate(self, bandwidth: Optional[float] = None,
                  polynomial_order: int = 1) -> RDDResults:
         """
@@ -225,25 +549,15 @@ class RegressionDiscontinuity:
         # Left panel: Binned scatter plot
         ax = axes[0]
 
-        # Create bins
-        bins_left = pd.cut(self.x_centered[self.x_centered < 0], bins=bins//2)
-        bins_right = pd.cut(self.x_centered[self.x_centered >= 0], bins=bins//2)
-
-        # Calculate bin means
-        df_left = pd.DataFrame({'x': self.x_centered[self.x_centered < 0],
-                               'y': self.outcome[self.x_centered < 0],
-                               'bin': bins_left})
-        df_right = pd.DataFrame({'x': self.x_centered[self.x_centered >= 0],
-                                'y': self.outcome[self.x_centered >= 0],
-                                'bin': bins_right})
-
-        bin_means_left = df_left.groupby('bin')[['x', 'y']].mean()
-        bin_means_right = df_right.groupby('bin')[['x', 'y']].mean()
+        # Binned means on each side of the cutoff
+        left = self.x_centered < 0
+        x_left, y_left = _binned_means(self.x_centered[left], self.outcome[left], bins // 2)
+        x_right, y_right = _binned_means(self.x_centered[~left], self.outcome[~left], bins // 2)
 
         # Plot binned means
-        ax.scatter(bin_means_left['x'], bin_means_left['y'],
+        ax.scatter(x_left, y_left,
                   color='blue', s=50, alpha=0.6, label='Control')
-        ax.scatter(bin_means_right['x'], bin_means_right['y'],
+        ax.scatter(x_right, y_right,
                   color='red', s=50, alpha=0.6, label='Treatment')
 
         # Fit lines within bandwidth
@@ -253,15 +567,15 @@ class RegressionDiscontinuity:
         # Left polynomial
         if mask_left.sum() > 0:
             x_plot_left = np.linspace(self.x_centered[mask_left].min(), 0, 100)
-            poly_left = np.polyfit(self.x_centered[mask_left], self.outcome[mask_left], 1)
-            y_plot_left = np.polyval(poly_left, x_plot_left)
+            intercept, slope = _line_fit(self.x_centered[mask_left], self.outcome[mask_left])
+            y_plot_left = intercept + slope * x_plot_left
             ax.plot(x_plot_left, y_plot_left, 'b-', linewidth=2, label='Fit (Control)')
 
         # Right polynomial
         if mask_right.sum() > 0:
             x_plot_right = np.linspace(0, self.x_centered[mask_right].max(), 100)
-            poly_right = np.polyfit(self.x_centered[mask_right], self.outcome[mask_right], 1)
-            y_plot_right = np.polyval(poly_right, x_plot_right)
+            intercept, slope = _line_fit(self.x_centered[mask_right], self.outcome[mask_right])
+            y_plot_right = intercept + slope * x_plot_right
             ax.plot(x_plot_right, y_plot_right, 'r-', linewidth=2, label='Fit (Treatment)')
 
         # Vertical line at cutoff
@@ -389,8 +703,7 @@ def example_bandwidth_sensitivity():
     ci_lower = []
     ci_upper = []
 
-    for bw in bandwidths:
-        results = rdd.local_linear_regression(bandwidth=bw)
+    for results in rdd.bandwidth_sweep(bandwidths):
         effects.append(results.treatment_effect)
         ci_lower.append(results.ci_lower)
         ci_upper.append(results.ci_upper)
@@ -0,0 +1,184 @@
+"""
+Unit tests for causal inference implementations.
+
+Tests for regression discontinuity, instrumental variables and
+difference-in-differences estimators.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The estimators live next to this directory, in code/python
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'python'))
+
+from diff_in_diff import DifferenceInDifferences  # noqa: E402
+from instrumental_variables import InstrumentalVariables  # noqa: E402
+from regression_discontinuity import RegressionDiscontinuity  # noqa: E402
+
+
+# ============================================================================
+# Test Utilities
+# ============================================================================
+
+def assert_same_results(result, reference, rtol=1e-10):
+    """
+    Check that two result dataclasses agree field by field.
+
+    Parameters
+    ----------
+    result, reference : dataclass
+        Results to compare; integer and None fields must match exactly
+    rtol : float
+        Relative tolerance for floating-point fields
+    """
+    for field, expected in vars(reference).items():
+        actual = getattr(result, field)
+        if expected is None:
+            assert actual is None, field
+        elif isinstance(expected, (int, np.integer)):
+            assert actual == expected, field
+        else:
+            np.testing.assert_allclose(actual, expected, rtol=rtol,
+                                       err_msg=field)
+
+
+# ============================================================================
+# Regression Discontinuity Tests
+# ============================================================================
+
+class TestRegressionDiscontinuity:
+    """Test suite for the sharp RDD estimator."""
+
+    @pytest.fixture(scope="class")
+    def rdd(self):
+        """Sharp design with a jump of 5 at the cutoff 0.5."""
+        rng = np.random.default_rng(0)
+        x = rng.uniform(-2, 3, 2000)
+        y = 10 + 2 * x + 0.5 * x**2 + 5.0 * (x >= 0.5) + rng.normal(0, 1, 2000)
+        return RegressionDiscontinuity(x, y, cutoff=0.5)
+
+    @pytest.mark.parametrize("polynomial_order", [1, 2])
+    def test_bandwidth_sweep_matches_local_regression(self, rdd,
+                                                      polynomial_order):
+        """One sweep equals a separate local fit per bandwidth."""
+        bandwidths = np.array([0.3, 0.5, 1.0, 1.7])
+        sweep = rdd.bandwidth_sweep(bandwidths, polynomial_order)
+
+        assert len(sweep) == len(bandwidths)
+        for bandwidth, result in zip(bandwidths, sweep):
+            assert_same_results(
+                result, rdd.local_linear_regression(bandwidth, polynomial_order))
+
+    @pytest.mark.parametrize("polynomial_order", [1, 2])
+    def test_numba_matches_local_regression(self, rdd, polynomial_order):
+        """The compiled WLS kernel gives the NumPy estimate."""
+        pytest.importorskip("numba")
+        for bandwidth in (0.5, 1.7):
+            assert_same_results(
+                rdd.local_linear_regression_numba(bandwidth, polynomial_order),
+                rdd.local_linear_regression(bandwidth, polynomial_order),
+                rtol=1e-8)
+
+
+# ============================================================================
+# Instrumental Variables Tests
+# ============================================================================
+
+class TestInstrumentalVariables:
+    """Test suite for the 2SLS estimator."""
+
+    @pytest.fixture(scope="class")
+    def data(self):
+        """Endogenous treatment with two instruments and two controls."""
+        rng = np.random.default_rng(1)
+        n = 3000
+        Z = rng.standard_normal((n, 2))
+        X = rng.standard_normal((n, 2))
+        u = rng.standard_normal(n)
+        D = Z @ [1.0, 0.5] + X @ [0.3, 0.0] + 0.8 * u + rng.standard_normal(n)
+        Y = 1.0 + 2.0 * D + X @ [1.0, -1.0] + u * (1 + 0.5 * np.abs(Z[:, 0]))
+        return Y, D, Z, X
+
+    @pytest.mark.parametrize("robust_se", [True, False])
+    @pytest.mark.parametrize("with_controls", [True, False])
+    def test_fit_numba_matches_fit(self, data, robust_se, with_controls):
+        """Coefficients, SEs and diagnostics agree between the two fits."""
+        pytest.importorskip("numba")
+        Y, D, Z, X = data
+        iv = InstrumentalVariables(Y, D, Z, X if with_controls else None)
+
+        assert_same_results(iv.fit_numba(robust_se), iv.fit(robust_se),
+                            rtol=1e-8)
+
+    def test_recovers_effect(self, data):
+        """2SLS removes the endogeneity bias of the treatment."""
+        Y, D, Z, X = data
+        result = InstrumentalVariables(Y, D, Z, X).fit()
+        assert abs(result.beta_iv[-1, 0] - 2.0) < 4 * result.se_iv[-1]
+
+    def test_refit_after_reassigning_instruments(self, data):
+        """Replacing Z on the instance rebuilds the first-stage factor."""
+        Y, D, Z, X = data
+        iv = InstrumentalVariables(Y, D, Z, X)
+        iv.fit()
+        iv.Z = Z[:, :1].copy()
+
+        assert_same_results(iv.fit(),
+                            InstrumentalVariables(Y, D, Z[:, :1], X).fit())
+
+
+# ============================================================================
+# Difference-in-Differences Tests
+# ============================================================================
+
+class TestDifferenceInDifferences:
+    """Test suite for the difference-in-differences estimator."""
+
+    @pytest.fixture(scope="class")
+    def panel(self):
+        """Two-period panel with unbalanced groups and an effect of 3."""
+        rng = np.random.default_rng(2)
+        n_units = 300
+        treated = (rng.random(n_units) < 0.3).astype(int)
+        unit_fe = rng.normal(0, 2, n_units)
+        rows = []
+        for post in (0, 1):
+            y = (unit_fe + 1.5 * post + 3.0 * treated * post
+                 + rng.normal(0, 1, n_units))
+            rows.append(pd.DataFrame({'unit_id': np.arange(n_units),
+                                      'post': post, 'treated': treated,
+                                      'outcome': y}))
+        return pd.concat(rows, ignore_index=True)
+
+    def test_2x2_matches_ols_interaction(self, panel):
+        """The cell-mean ATT equals the OLS Treat x Post coefficient."""
+        d = panel['treated'].to_numpy(float)
+        t = panel['post'].to_numpy(float)
+        X = np.column_stack([np.ones(len(panel)), d, t, d * t])
+        beta = np.linalg.lstsq(X, panel['outcome'].to_numpy(), rcond=None)[0]
+
+        result = DifferenceInDifferences(panel).estimate_2x2()
+
+        np.testing.assert_allclose(result.att, beta[3], rtol=1e-10)
+        assert result.ci_lower < 3.0 < result.ci_upper
+        assert result.n_treat + result.n_control == panel['unit_id'].nunique()
+
+    def test_2x2_accepts_bool_treatment(self, panel):
+        """A bool treated column gives the same estimate as 0/1."""
+        as_bool = panel.assign(treated=panel['treated'].astype(bool))
+        assert_same_results(DifferenceInDifferences(as_bool).estimate_2x2(),
+                            DifferenceInDifferences(panel).estimate_2x2())
+
+    @pytest.mark.parametrize("column,values", [
+        ('post', lambda df: df['post'] * 2),
+        ('treated', lambda df: df['treated'] * 0.5),
+    ])
+    def test_2x2_rejects_non_binary_columns(self, panel, column, values):
+        """Codes other than 0/1 raise instead of being truncated."""
+        bad = panel.assign(**{column: values(panel)})
+        with pytest.raises(ValueError, match=column):
+            DifferenceInDifferences(bad).estimate_2x2()
@@ -9,11 +9,16 @@ Usage:
     python scripts/spell_check.py file.tex
     python scripts/spell_check.py --all
     python scripts/spell_check.py --directory deep_learning/
+    python scripts/spell_check.py --all --jobs 4
 """
 
 import argparse
+import mmap
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import List, Set, Tuple
 
@@ -29,7 +34,7 @@ except ImportError:
 # ============================================================================
 
 # Technical terms and acronyms to ignore
-TECHNICAL_TERMS = {
+TECHNICAL_TERMS = frozenset({
     # Math/Stats
     "arima", "arma", "sarima", "garch", "lstm", "gru", "relu", "softmax",
     "sigmoid", "tanh", "pooling", "backpropagation", "autoregressive",
@@ -58,23 +63,30 @@ TECHNICAL_TERMS = {
 
     # Abbreviations
     "etc", "eg", "ie", "vs", "http", "https", "www",
-}
+})
 
-# LaTeX commands to ignore content within
-LATEX_ENVIRONMENTS_TO_SKIP = {
+# LaTeX commands to ignore content within; where two patterns match at the
+# same position the earlier one wins, so display math precedes inline math.
+# Math delimiters skip escaped dollars (\$); the lookbehind follows the
+# literal $ so the regex engine can still jump straight to candidates.
+LATEX_ENVIRONMENTS_TO_SKIP = [
     r'\\begin\{equation\}.*?\\end\{equation\}',
     r'\\begin\{align\}.*?\\end\{align\}',
     r'\\begin\{lstlisting\}.*?\\end\{lstlisting\}',
     r'\\begin\{verbatim\}.*?\\end\{verbatim\}',
-    r'\$.*?\$',  # Inline math
-    r'\$\$.*?\$\$',  # Display math
+    r'\$(?<!\\\$)\$.*?(?<!\\)\$\$',  # Display math
+    r'\$(?<!\\\$).*?(?<!\\)\$',  # Inline math
     r'\\cite\{.*?\}',  # Citations
     r'\\ref\{.*?\}',  # References
     r'\\label\{.*?\}',  # Labels
     r'\\includegraphics.*?\{.*?\}',  # Graphics
     r'\\url\{.*?\}',  # URLs
     r'\\href\{.*?\}\{.*?\}',  # Hyperlinks
-}
+]
+
+# Directories never searched for LaTeX files (matched as substrings of the
+# path, so e.g. build_pdf/ is skipped too)
+SKIP_DIRECTORIES = ('build', '.git', '__pycache__', 'node_modules')
 
 # LaTeX commands to remove but keep their content
 LATEX_COMMANDS_TO_STRIP = [
@@ -85,11 +97,28 @@ LATEX_COMMANDS_TO_STRIP = [
     r'\\texttt\{(.*?)\}',
 ]
 
+# Patterns compiled once at import rather than looked up on every call. The
+# skip and strip lists are each joined into one alternation, so the text is
+# scanned once per list instead of once per pattern.
+_SKIP_RE = re.compile(
+    '|'.join(f'(?:{p})' for p in LATEX_ENVIRONMENTS_TO_SKIP), re.DOTALL)
+_STRIP_RE = re.compile('|'.join(f'(?:{p})' for p in LATEX_COMMANDS_TO_STRIP))
+_COMMENT_RE = re.compile(r'(?<!\\)%.*$', re.MULTILINE)
+_CMD_WITH_ARGS_RE = re.compile(r'\\[a-zA-Z]+\*?(?:\[.*?\])?\{.*?\}')
+_CMD_RE = re.compile(r'\\[a-zA-Z]+\*?')
+_SPECIAL_RE = re.compile(r'[{}\\]')
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+
 
 # ============================================================================
 # LaTeX Processing
 # ============================================================================
 
+def _kept_group(match: re.Match) -> str:
+    """Return the content of whichever stripped command matched."""
+    return next(g for g in match.groups() if g is not None)
+
+
 def extract_text_from_latex(content: str) -> str:
     """
     Extract plain text from LaTeX content for spell checking.
@@ -107,26 +136,52 @@ def extract_text_from_latex(content: str) -> str:
     text = content
 
     # Remove comments
-    text = re.sub(r'(?<!\\)%.*$', '', text, flags=re.MULTILINE)
+    text = _COMMENT_RE.sub('', text)
 
     # Remove math and other environments
-    for pattern in LATEX_ENVIRONMENTS_TO_SKIP:
-        text = re.sub(pattern, ' ', text, flags=re.DOTALL)
+    text = _SKIP_RE.sub(' ', text)
 
-    # Strip LaTeX commands but keep content
-    for pattern in LATEX_COMMANDS_TO_STRIP:
-        text = re.sub(pattern, r'\1', text)
+    # Strip LaTeX commands but keep content; each alternative has its own
+    # group, and nested commands need another pass
+    n_subs = 1
+    while n_subs:
+        text, n_subs = _STRIP_RE.subn(_kept_group, text)
 
     # Remove remaining LaTeX commands
-    text = re.sub(r'\\[a-zA-Z]+\*?(?:\[.*?\])?\{.*?\}', ' ', text)
-    text = re.sub(r'\\[a-zA-Z]+\*?', ' ', text)
+    text = _CMD_WITH_ARGS_RE.sub(' ', text)
+    text = _CMD_RE.sub(' ', text)
 
     # Remove special characters
-    text = re.sub(r'[{}\\]', ' ', text)
+    text = _SPECIAL_RE.sub(' ', text)
 
     return text
 
 
+def read_latex(file_path: Path) -> str:
+    """
+    Read a LaTeX file through a read-only memory map.
+
+    The mapped file is decoded straight into a ``str``, without first
+    copying it into an intermediate ``bytes`` object.
+
+    Parameters
+    ----------
+    file_path : Path
+        Path to LaTeX file
+
+    Returns
+    -------
+    content : str
+        File content
+    """
+    with open(file_path, 'rb') as f:
+        # An empty file cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, 'utf-8')
+
+
 def tokenize(text: str) -> List[str]:
     """
     Split text into words for spell checking.
@@ -141,11 +196,13 @@ def tokenize(text: str) -> List[str]:
     words : List[str]
         List of words
     """
-    # Split on whitespace and punctuation
-    words = re.findall(r'\b[a-zA-Z]+\b', text)
+    # Split on whitespace and punctuation; letters glued to digits never
+    # form a word, so identifiers like x86 are already left out
+    words = _WORD_RE.findall(text)
 
-    # Convert to lowercase
-    words = [w.lower() for w in words]
+    # Drop acronyms (all capitals), which a dictionary cannot judge, and
+    # convert the rest to lowercase
+    words = [w.lower() for w in words if not w.isupper()]
 
     # Filter out very short words and numbers
     words = [w for w in words if len(w) > 2]
@@ -157,6 +214,34 @@ def tokenize(text: str) -> List[str]:
 # Spell Checking
 # ============================================================================
 
+@lru_cache(maxsize=1)
+def _build_spell(custom_dictionary: frozenset) -> SpellChecker:
+    """
+    Build the spell checker with the technical terms and custom words.
+
+    Loading the word-frequency dictionary dominates start-up, so the
+    checker is built once per process and shared by every file.
+    Suggestions are limited to edit distance 1: the default of 2
+    enumerates the edits of every edit, which for long technical words
+    takes seconds per word.
+    """
+    spell = SpellChecker(distance=1)
+
+    # Add custom dictionary
+    if custom_dictionary:
+        spell.word_frequency.load_words(custom_dictionary)
+
+    # Add technical terms
+    spell.word_frequency.load_words(TECHNICAL_TERMS)
+
+    return spell
+
+
+def _init_worker(custom_dictionary: frozenset):
+    """Load the word-frequency dictionary once in a worker process."""
+    _build_spell(custom_dictionary)
+
+
 def check_spelling(
     file_path: Path,
     custom_dictionary: Set[str] = None
@@ -178,36 +263,39 @@ def check_spelling(
     """
     # Read file
     try:
-        content = file_path.read_text(encoding='utf-8')
+        content = read_latex(file_path)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return []
 
-    # Extract text
+    # Extract text, dropping each full-size string once it is consumed
     text = extract_text_from_latex(content)
+    del content
 
     # Tokenize
     words = tokenize(text)
+    del text
 
-    # Initialize spell checker
-    spell = SpellChecker()
+    # Spell checker shared by every file in this process
+    spell = _build_spell(frozenset(custom_dictionary or ()))
 
-    # Add custom dictionary
+    # Find misspelled words, looking each distinct word up once; known
+    # technical and custom words are removed by plain set difference
+    # before the spell checker's own lookup
+    words = set(words) - TECHNICAL_TERMS
     if custom_dictionary:
-        spell.word_frequency.load_words(custom_dictionary)
-
-    # Add technical terms
-    spell.word_frequency.load_words(TECHNICAL_TERMS)
-
-    # Find misspelled words
+        words -= custom_dictionary
     misspelled = spell.unknown(words)
 
-    # Get suggestions for each misspelled word
+    # Get suggestions for each misspelled word, most frequent first; words
+    # with no candidate at all are not reported
     errors = []
     for word in sorted(misspelled):
         suggestions = spell.candidates(word)
         if suggestions:
-            errors.append((word, list(suggestions)[:5]))  # Top 5 suggestions
+            suggestions = sorted(suggestions,
+                                 key=lambda w: (-spell.word_frequency[w], w))
+            errors.append((word, suggestions[:5]))  # Top 5 suggestions
 
     return errors
 
@@ -235,6 +323,31 @@ def print_report(file_path: Path, errors: List[Tuple[str, List[str]]]):
 # Main
 # ============================================================================
 
+def find_latex_files(root: Path) -> List[Path]:
+    """
+    Find the .tex files under a directory, skipping build directories.
+
+    Skipped directories are pruned from the walk, so their contents are
+    never listed or stat'ed.
+
+    Parameters
+    ----------
+    root : Path
+        Directory to search
+
+    Returns
+    -------
+    files : List[Path]
+        LaTeX files found
+    """
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames
+                       if not any(p in d for p in SKIP_DIRECTORIES)]
+        files.extend(Path(dirpath) / f for f in filenames if f.endswith('.tex'))
+    return files
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -266,6 +379,12 @@ def main():
         action="store_true",
         help="Only show files with errors"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of files to check in parallel (default: CPU count)"
+    )
 
     args = parser.parse_args()
 
@@ -278,24 +397,36 @@ def main():
 
     # Determine files to check
     if args.all:
-        files = list(Path('.').rglob('*.tex'))
+        files = find_latex_files(Path('.'))
     elif args.directory:
-        files = list(args.directory.rglob('*.tex'))
+        files = find_latex_files(args.directory)
     elif args.file:
         files = [args.file]
     else:
         parser.print_help()
         return 1
 
-    # Check each file
-    total_errors = 0
-    for file_path in sorted(files):
-        # Skip build directories
-        if any(p in str(file_path) for p in ['build', '.git', '__pycache__']):
-            continue
-
-        errors = check_spelling(file_path, custom_dict)
+    # Skip build directories
+    to_check = [
+        file_path for file_path in sorted(files)
+        if not any(p in str(file_path) for p in SKIP_DIRECTORIES)
+    ]
+
+    # Check each file; with several jobs the files are spread over worker
+    # processes, each of which loads the spell checker once
+    custom_dict = frozenset(custom_dict)
+    jobs = min(args.jobs, len(to_check))
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(custom_dict,)) as executor:
+            results = list(executor.map(
+                partial(check_spelling, custom_dictionary=custom_dict),
+                to_check))
+    else:
+        results = [check_spelling(file_path, custom_dict) for file_path in to_check]
 
+    total_errors = 0
+    for file_path, errors in zip(to_check, results):
         if not args.quiet or errors:
             print_report(file_path, errors)
 